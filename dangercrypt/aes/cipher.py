@@ -0,0 +1,253 @@
+"""
+The AES block cipher, FIPS 197 sec. 5
+
+Two implementations of the same thing:
+
+* a reference one that follows the spec's Cipher/InvCipher step by step on a
+  :class:`State` (SubBytes, ShiftRows, MixColumns, AddRoundKey), and works for
+  the non-standard column counts and byte sizes State allows
+* a fast one for 8-bit bytes using T-tables: four 256-entry tables of 32-bit
+  words that fold SubBytes, ShiftRows and MixColumns together, so a round is one
+  lookup per state byte plus XORs. Decryption uses the equivalent inverse cipher
+  (sec. 5.3.5).
+"""
+import functools
+import struct
+
+from dangercrypt.aes import keymixing
+from dangercrypt.aes import sbox as _sbox
+from dangercrypt.aes.objects import AES_BYTE_SIZE, AES_COLS, AES_ROWS, State
+
+
+def shift_offsets(cols: int) -> tuple[int, int, int, int]:
+    """ShiftRows offsets per row (Rijndael, for block sizes beyond AES's Nb = 4)"""
+    if cols <= 6:
+        return (0, 1, 2, 3)
+    if cols == 7:
+        return (0, 1, 2, 4)
+    return (0, 1, 3, 4)
+
+
+# -- reference path, FIPS 197 sec. 5.1 and 5.3 --------------------------------
+
+
+def add_round_key(state: State, words) -> None:
+    rows = state.rows
+    for c, word in enumerate(words):
+        for r, k in enumerate(word):
+            state.bytes[r + rows * c] ^= k
+
+
+def shift_rows(state: State, *, inverse=False) -> None:
+    rows, cols = state.rows, state.cols
+    data = state.bytes
+    for r, shift in enumerate(shift_offsets(cols)):
+        shift = (-shift if inverse else shift) % cols
+        if shift:
+            row = data[r::rows]
+            data[r::rows] = row[shift:] + row[:shift]
+
+
+def mix_columns(state: State, *, inverse=False) -> None:
+    for c in range(state.cols):
+        state.set_column(
+            c, keymixing.mix_column(state.column(c), state.byte_size, inverse=inverse)
+        )
+
+
+def _check_shape(rows):
+    if rows != AES_ROWS:
+        raise ValueError(f"MixColumns needs {AES_ROWS} rows, not {rows}")
+
+
+def encrypt_state(state: State, words) -> State:
+    """Cipher(): encrypt *state* in place with the expanded key *words*"""
+    _check_shape(state.rows)
+    box = _sbox.get_sbox(state.byte_size)
+    nb = state.cols
+    nr = len(words) // nb - 1
+
+    add_round_key(state, words[:nb])
+    for round_ in range(1, nr + 1):
+        box.sub_bytes(state)
+        shift_rows(state)
+        if round_ != nr:
+            mix_columns(state)
+        add_round_key(state, words[round_ * nb : (round_ + 1) * nb])
+    return state
+
+
+def decrypt_state(state: State, words) -> State:
+    """InvCipher(): decrypt *state* in place with the expanded key *words*"""
+    _check_shape(state.rows)
+    box = _sbox.get_sbox(state.byte_size)
+    nb = state.cols
+    nr = len(words) // nb - 1
+
+    add_round_key(state, words[nr * nb : (nr + 1) * nb])
+    for round_ in range(nr - 1, -1, -1):
+        shift_rows(state, inverse=True)
+        box.inv_sub_bytes(state)
+        add_round_key(state, words[round_ * nb : (round_ + 1) * nb])
+        if round_:
+            mix_columns(state, inverse=True)
+    return state
+
+
+# -- T-table path ---------------------------------------------------------------
+
+
+def _rotr32(word, n):
+    return ((word >> n) | (word << (32 - n))) & 0xFFFFFFFF
+
+
+def _pack_word(b0, b1, b2, b3):
+    return (b0 << 24) | (b1 << 16) | (b2 << 8) | b3
+
+
+@functools.lru_cache(maxsize=1)
+def t_tables():
+    """
+    Encryption tables Te0-Te3, decryption tables Td0-Td3, and the S-box and its
+    inverse (for the last round). Te0[x] is the MixColumns column for S[x] in
+    row 0; the others are its byte rotations for rows 1-3.
+    """
+    box = _sbox.get_sbox(8)
+    mul, forward, backward = keymixing.mix_polys(8)
+    s, inv_s = box.forward, box.inverse
+
+    # column contributions of a byte in row 0: coefficients a_0, a_1, a_2, a_3
+    te0 = [_pack_word(*(mul(c, s[x]) for c in forward)) for x in range(256)]
+    td0 = [_pack_word(*(mul(c, inv_s[x]) for c in backward)) for x in range(256)]
+
+    te = tuple([_rotr32(w, 8 * k) for w in te0] for k in range(4))
+    td = tuple([_rotr32(w, 8 * k) for w in td0] for k in range(4))
+    return te, td, s, inv_s
+
+
+class AES:
+    """
+    AES (or Rijndael, for other column counts and byte sizes) keyed with *key*.
+
+    *fast* picks the T-table implementation; by default it's used whenever the
+    shape allows (4 rows of 8-bit bytes), and the reference one otherwise.
+    """
+
+    def __init__(
+        self,
+        key,
+        *,
+        rows=AES_ROWS,
+        cols=AES_COLS,
+        byte_size=AES_BYTE_SIZE,
+        fast=None,
+    ):
+        _check_shape(rows)
+        self.rows = rows
+        self.cols = cols
+        self.byte_size = byte_size
+        self.block_size = rows * cols
+
+        can_be_fast = byte_size == 8
+        if fast and not can_be_fast:
+            raise ValueError("T-tables need 8-bit bytes")
+        self.fast = can_be_fast if fast is None else fast
+
+        self.schedule = keymixing.get_key_schedule(
+            key, rows=rows, cols=cols, byte_size=byte_size
+        )
+        self.words = self.schedule.words
+        self._scratch = State(rows=rows, cols=cols, byte_size=byte_size)
+        self.rounds = self.schedule.rounds
+
+        if self.fast:
+            words = struct.Struct(f">{cols}I")
+            self._words_struct = words
+            self._enc_keys = list(words.iter_unpack(self.schedule.encryption))
+            self._dec_keys = list(words.iter_unpack(self.schedule.decryption))
+
+    def __repr__(self):
+        kind = "T-table" if self.fast else "reference"
+        return (
+            f"<{self.__class__.__name__} {self.rows}x{self.cols} "
+            f"{self.byte_size}-bit bytes, {self.rounds} rounds, {kind}>"
+        )
+
+    def _state(self, block):
+        if len(block) != self.block_size:
+            raise ValueError(f"block must be {self.block_size} bytes, not {len(block)}")
+        # one State per cipher, reloaded for every block
+        return self._scratch.load(block)
+
+    def _output(self, state):
+        return bytes(state.bytes) if self.byte_size <= 8 else list(state.bytes)
+
+    def encrypt_block(self, block):
+        if self.fast:
+            return self._encrypt_fast(block)
+        return self._output(encrypt_state(self._state(block), self.words))
+
+    def decrypt_block(self, block):
+        if self.fast:
+            return self._decrypt_fast(block)
+        return self._output(decrypt_state(self._state(block), self.words))
+
+    def _encrypt_fast(self, block):
+        if len(block) != self.block_size:
+            raise ValueError(f"block must be {self.block_size} bytes, not {len(block)}")
+        (te0, te1, te2, te3), _, s, _ = t_tables()
+        nb = self.cols
+        _, s1, s2, s3 = shift_offsets(nb)
+        keys = self._enc_keys
+
+        w = [a ^ k for a, k in zip(self._words_struct.unpack(bytes(block)), keys[0])]
+        for round_keys in keys[1:-1]:
+            w = [
+                te0[w[c] >> 24]
+                ^ te1[(w[(c + s1) % nb] >> 16) & 0xFF]
+                ^ te2[(w[(c + s2) % nb] >> 8) & 0xFF]
+                ^ te3[w[(c + s3) % nb] & 0xFF]
+                ^ round_keys[c]
+                for c in range(nb)
+            ]
+        w = [
+            _pack_word(
+                s[w[c] >> 24],
+                s[(w[(c + s1) % nb] >> 16) & 0xFF],
+                s[(w[(c + s2) % nb] >> 8) & 0xFF],
+                s[w[(c + s3) % nb] & 0xFF],
+            )
+            ^ keys[-1][c]
+            for c in range(nb)
+        ]
+        return self._words_struct.pack(*w)
+
+    def _decrypt_fast(self, block):
+        if len(block) != self.block_size:
+            raise ValueError(f"block must be {self.block_size} bytes, not {len(block)}")
+        _, (td0, td1, td2, td3), _, inv_s = t_tables()
+        nb = self.cols
+        _, s1, s2, s3 = shift_offsets(nb)
+        keys = self._dec_keys
+
+        w = [a ^ k for a, k in zip(self._words_struct.unpack(bytes(block)), keys[0])]
+        for round_keys in keys[1:-1]:
+            w = [
+                td0[w[c] >> 24]
+                ^ td1[(w[(c - s1) % nb] >> 16) & 0xFF]
+                ^ td2[(w[(c - s2) % nb] >> 8) & 0xFF]
+                ^ td3[w[(c - s3) % nb] & 0xFF]
+                ^ round_keys[c]
+                for c in range(nb)
+            ]
+        w = [
+            _pack_word(
+                inv_s[w[c] >> 24],
+                inv_s[(w[(c - s1) % nb] >> 16) & 0xFF],
+                inv_s[(w[(c - s2) % nb] >> 8) & 0xFF],
+                inv_s[w[(c - s3) % nb] & 0xFF],
+            )
+            ^ keys[-1][c]
+            for c in range(nb)
+        ]
+        return self._words_struct.pack(*w)
@@ -8,11 +8,198 @@ FIPS 197, Figure 4:
 AES-128 |     4      |     4      |    10
 AES-192 |     6      |     4      |    12
 AES-256 |     8      |     4      |    14
+
+Words are lists of ``rows`` bytes (4 for AES), so the same expansion works for
+the non-standard shapes and byte sizes :class:`State` allows; Nr follows the
+Rijndael rule max(Nk, Nb) + 6.
+
+Expanding a key costs more than encrypting a block with it, so
+:func:`get_key_schedule` keeps the last ``KEY_SCHEDULE_CACHE_SIZE`` expansions
+(with their decryption schedules) keyed by the key bytes and shape.
 """
+import array
+import functools
+
+import finite
+from dangercrypt.aes import sbox as _sbox
+from dangercrypt.xtra import math as xm
+from dangercrypt.xtra import polymul
+
+
+KEY_SCHEDULE_CACHE_SIZE = 64
+
+# MixColumns multiplies each column by a(x) = {03}x^3 + {01}x^2 + {01}x + {02}
+# modulo x^4 + 1, coefficients lowest order first
+MIX_POLY = (0x02, 0x01, 0x01, 0x03)
+
+
+def n_rounds(nk: int, nb: int) -> int:
+    return max(nk, nb) + 6
+
+
+def sub_word(word: list[int], byte_size=8) -> list[int]:
+    """Apply the S-box to each byte of *word*"""
+    forward = _sbox.get_sbox(byte_size).forward
+    return [forward[b] for b in word]
+
+
+def rot_word(word: list[int]) -> list[int]:
+    """Cyclic permutation [a0, a1, a2, a3] -> [a1, a2, a3, a0]"""
+    return word[1:] + word[:1]
+
+
+def rcon(i: int, rows=4, byte_size=8) -> list[int]:
+    """Round constant [x^(i-1), 0, 0, 0] with x^(i-1) in GF(2^byte_size)"""
+    mul = xm.ffmultiplier(byte_size, _modulus(byte_size))
+    x = 1
+    for _ in range(i - 1):
+        x = mul(x, 2)
+    return [x] + [0] * (rows - 1)
+
+
+def _modulus(byte_size):
+    coeffs = _sbox.get_sbox(byte_size).field.mod_poly
+    return sum(c << k for k, c in enumerate(coeffs))
+
+
+def expand_key(key, *, rows=4, cols=4, byte_size=8) -> list[list[int]]:
+    """
+    FIPS 197 sec. 5.2 KeyExpansion: *key* (a sequence of bytes, Nk * rows long)
+    into Nb * (Nr + 1) words
+    """
+    key = list(key)
+    if len(key) % rows:
+        raise ValueError(f"key length {len(key)} is not a multiple of {rows}")
+    if any(b >> byte_size for b in key):
+        raise ValueError(f"key has bytes wider than {byte_size} bits")
+
+    nk = len(key) // rows
+    nr = n_rounds(nk, cols)
+    words = [key[rows * i : rows * (i + 1)] for i in range(nk)]
+    for i in range(nk, cols * (nr + 1)):
+        temp = words[i - 1]
+        if i % nk == 0:
+            temp = sub_word(rot_word(temp), byte_size)
+            temp = [a ^ b for a, b in zip(temp, rcon(i // nk, rows, byte_size))]
+        elif nk > 6 and i % nk == 4:
+            temp = sub_word(temp, byte_size)
+        words.append([a ^ b for a, b in zip(words[i - nk], temp)])
+    return words
+
+
+def _ring_mul(a, b, mul):
+    """Product of two length-4 polynomials modulo x^4 + 1 over GF(2^n)"""
+    result = [0] * 4
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            result[(i + j) % 4] ^= mul(x, y)
+    return tuple(result)
+
+
+@functools.lru_cache(maxsize=16)
+def mix_polys(byte_size=8):
+    """
+    Multiplier, and the forward and inverse MixColumns polynomials. In
+    characteristic 2, a(x)^4 = a(1)^4 = 1 mod x^4 + 1, so a^-1 = a^3 (which for
+    bytes is the spec's {0b}x^3 + {0d}x^2 + {09}x + {0e}).
+    """
+    mul = xm.ffmultiplier(byte_size, _modulus(byte_size))
+    inverse = _ring_mul(_ring_mul(MIX_POLY, MIX_POLY, mul), MIX_POLY, mul)
+    return mul, MIX_POLY, inverse
+
+
+def mix_column(column, byte_size=8, *, inverse=False) -> list[int]:
+    """(Inv)MixColumns of a single 4-byte column"""
+    mul, forward, backward = mix_polys(byte_size)
+    coeffs = backward if inverse else forward
+    return [
+        functools.reduce(
+            int.__xor__, (mul(coeffs[(r - k) % 4], s) for k, s in enumerate(column))
+        )
+        for r in range(4)
+    ]
+
+
+def mix_matrix(byte_size=8, *, inverse=False) -> finite.FieldMatrix:
+    """
+    (Inv)MixColumns as the 4x4 circulant matrix over GF(2^byte_size) that each
+    column is multiplied by; a new one every call, so it's the caller's to change
+    """
+    _, forward, backward = mix_polys(byte_size)
+    coeffs = backward if inverse else forward
+    field = _sbox.get_sbox(byte_size).field
+    return finite.FieldMatrix(field, [[coeffs[(r - k) % 4] for k in range(4)] for r in range(4)])
+
+
+class KeySchedule:
+    """
+    A key expanded once: the ``Nb * (Nr + 1)`` round-key words, flattened into one
+    buffer, and (lazily) the decryption schedule for the equivalent inverse cipher
+    (FIPS 197 sec. 5.3.5): the same round keys in reverse order, with
+    InvMixColumns applied to all but the first and last.
+
+    Schedules are shared through :func:`get_key_schedule`, so treat them as
+    immutable; the buffers are only handed out as read-only memoryviews.
+    """
+
+    def __init__(self, key, *, rows=4, cols=4, byte_size=8):
+        self.key = key
+        self.rows = rows
+        self.cols = cols
+        self.byte_size = byte_size
+        self.words = expand_key(key, rows=rows, cols=cols, byte_size=byte_size)
+        self.rounds = len(self.words) // cols - 1
+        self._typecode = polymul.array_typecode(2 ** byte_size)
+        self._encryption = array.array(
+            self._typecode, (b for word in self.words for b in word)
+        )
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} {len(self.key) * self.byte_size}-bit key, "
+            f"{self.rows}x{self.cols}, {self.rounds} rounds>"
+        )
+
+    @property
+    def round_key_size(self) -> int:
+        return self.rows * self.cols
+
+    @property
+    def encryption(self) -> memoryview:
+        return memoryview(self._encryption).toreadonly()
+
+    @functools.cached_property
+    def _decryption(self):
+        if self.rows != 4:
+            raise ValueError(f"MixColumns needs 4 rows, not {self.rows}")
+        nb = self.cols
+        words = self.words
+        out = array.array(self._typecode, (b for w in words[-nb:] for b in w))
+        for round_ in range(self.rounds - 1, 0, -1):
+            for word in words[round_ * nb : (round_ + 1) * nb]:
+                out.extend(mix_column(word, self.byte_size, inverse=True))
+        out.extend(b for w in words[:nb] for b in w)
+        return out
+
+    @property
+    def decryption(self) -> memoryview:
+        return memoryview(self._decryption).toreadonly()
+
+    def round_key(self, round_: int, *, decrypt=False) -> memoryview:
+        """Round key *round_* (0 ... Nr), in the order the (inverse) cipher uses them"""
+        if not 0 <= round_ <= self.rounds:
+            raise IndexError(f"round {round_} out of range 0-{self.rounds}")
+        size = self.round_key_size
+        buffer = self.decryption if decrypt else self.encryption
+        return buffer[round_ * size : (round_ + 1) * size]
+
 
-def sub_word():
-    pass
+@functools.lru_cache(maxsize=KEY_SCHEDULE_CACHE_SIZE)
+def _get_key_schedule(key, rows, cols, byte_size):
+    return KeySchedule(key, rows=rows, cols=cols, byte_size=byte_size)
 
 
-def rot_word():
-    pass
+def get_key_schedule(key, *, rows=4, cols=4, byte_size=8) -> KeySchedule:
+    """The (cached) :class:`KeySchedule` for *key*, a sequence of bytes"""
+    key = bytes(key) if byte_size <= 8 else tuple(key)
+    return _get_key_schedule(key, rows, cols, byte_size)
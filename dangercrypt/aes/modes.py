@@ -0,0 +1,405 @@
+"""
+Modes of operation (NIST SP 800-38A) over streams
+
+The input (a file object, a bytes-like object, or an iterable of bytes-like
+chunks) is read into one reused buffer of ``buffer_size`` bytes and handed to the
+cipher as memoryview slices, so memory stays bounded whatever the stream length.
+ECB and CBC use PKCS#7 padding, which only ever touches the final chunk; CTR
+needs none.
+
+    >>> aes = cipher.AES(key)
+    >>> with open("export", "rb") as src, open("export.enc", "wb") as dst:
+    ...     CBC(aes, iv).encrypt(src, dst)
+
+Each mode object carries its chaining state, so use a fresh one (or rather, a
+fresh IV/nonce) per message.
+
+CTR keystream blocks are independent of each other, so :class:`ParallelCTR`
+spreads them over a process pool. Each worker expands the key once (in the pool
+initializer) and writes its share of the keystream straight into a shared memory
+block, so only counters and offsets get pickled.
+"""
+import collections.abc
+import concurrent.futures
+from multiprocessing import shared_memory
+
+from dangercrypt.aes import cipher as _cipher
+
+
+BUFFER_SIZE = 1 << 16
+PARALLEL_BUFFER_SIZE = 1 << 20
+
+
+def pad(data, block_size: int) -> bytes:
+    """PKCS#7: append n bytes of value n, 1 <= n <= *block_size*"""
+    n = block_size - len(data) % block_size
+    return bytes(data) + bytes([n]) * n
+
+
+def unpad(data, block_size: int) -> bytes:
+    if not data or len(data) % block_size:
+        raise ValueError("padded data must be a non-zero multiple of the block size")
+    n = data[-1]
+    if not 1 <= n <= block_size or any(b != n for b in data[-n:]):
+        raise ValueError("bad padding")
+    return bytes(data[:-n])
+
+
+class _IterReader:
+    """``readinto`` over an iterable of bytes-like chunks, copying each byte once"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = memoryview(next(self._chunks)).cast("B")
+            except StopIteration:
+                return 0
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+class _ReadReader:
+    """``readinto`` for file-likes that only have ``read``"""
+
+    def __init__(self, f):
+        self._f = f
+
+    def readinto(self, buffer) -> int:
+        data = self._f.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _reader(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return _IterReader([source])
+    if hasattr(source, "readinto"):
+        return source
+    if hasattr(source, "read"):
+        return _ReadReader(source)
+    if isinstance(source, collections.abc.Iterable):
+        return _IterReader(source)
+    raise TypeError(f"can't read from {type(source).__name__}")
+
+
+def _fill(reader, view, start) -> int:
+    """Read into *view* from *start* until it's full or the stream ends"""
+    end = start
+    while end < len(view):
+        n = reader.readinto(view[end:])
+        if not n:
+            break
+        end += n
+    return end
+
+
+class Mode:
+    """
+    Base for the modes: subclasses provide ``_encrypt_blocks`` and
+    ``_decrypt_blocks``, which take a memoryview (a multiple of the block size,
+    except for the last chunk when unpadded) and return bytes, carrying any
+    chaining state between calls.
+    """
+
+    padding = True
+
+    def __init__(self, cipher, *, padding=None, buffer_size=BUFFER_SIZE):
+        self.cipher = cipher
+        self.block_size = cipher.block_size
+        if padding is not None:
+            self.padding = padding
+        if buffer_size % self.block_size or buffer_size < 2 * self.block_size:
+            raise ValueError(
+                f"buffer size must be a multiple of {self.block_size}, "
+                "and at least two blocks"
+            )
+        self.buffer_size = buffer_size
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.cipher!r}>"
+
+    def _stream(self, source, process, finish, hold_back):
+        reader = _reader(source)
+        size = self.buffer_size
+        view = memoryview(bytearray(size))
+        kept = 0
+        while True:
+            end = _fill(reader, view, kept)
+            if end < size:
+                break
+            # keep the last block(s) back when only the end of the stream may
+            # tell how to treat them (i.e. strip the padding)
+            cut = size - hold_back
+            yield process(view[:cut])
+            view[:hold_back] = view[cut:]
+            kept = hold_back
+        tail = finish(view[:end])
+        if tail:
+            yield tail
+
+    def _check_whole(self, view):
+        if len(view) % self.block_size:
+            raise ValueError(
+                f"unpadded data must be a multiple of {self.block_size} bytes"
+            )
+        return view
+
+    def _finish_encrypt(self, view):
+        if self.padding:
+            view = memoryview(pad(view, self.block_size))
+        return self._encrypt_blocks(self._check_whole(view))
+
+    def _finish_decrypt(self, view):
+        plaintext = self._decrypt_blocks(self._check_whole(view))
+        return unpad(plaintext, self.block_size) if self.padding else plaintext
+
+    def iter_encrypt(self, source):
+        """Yield the ciphertext of *source* in chunks of about ``buffer_size`` bytes"""
+        return self._stream(source, self._encrypt_blocks, self._finish_encrypt, 0)
+
+    def iter_decrypt(self, source):
+        hold_back = self.block_size if self.padding else 0
+        return self._stream(source, self._decrypt_blocks, self._finish_decrypt, hold_back)
+
+    def encrypt(self, source, sink=None):
+        """
+        Encrypt *source*. With a file object *sink*, write the ciphertext there as
+        it's produced and return its length; otherwise return it as bytes.
+        """
+        return self._drain(self.iter_encrypt(source), sink)
+
+    def decrypt(self, source, sink=None):
+        return self._drain(self.iter_decrypt(source), sink)
+
+    @staticmethod
+    def _drain(chunks, sink):
+        if sink is None:
+            return b"".join(chunks)
+        total = 0
+        for chunk in chunks:
+            sink.write(chunk)
+            total += len(chunk)
+        return total
+
+    def _blocks(self, view):
+        bs = self.block_size
+        return (view[i : i + bs] for i in range(0, len(view), bs))
+
+    def _encrypt_blocks(self, view) -> bytes:
+        raise NotImplementedError
+
+    def _decrypt_blocks(self, view) -> bytes:
+        raise NotImplementedError
+
+
+class ECB(Mode):
+    """Electronic codebook: every block on its own. Leaks repeated blocks."""
+
+    def _encrypt_blocks(self, view):
+        return b"".join(map(self.cipher.encrypt_block, self._blocks(view)))
+
+    def _decrypt_blocks(self, view):
+        return b"".join(map(self.cipher.decrypt_block, self._blocks(view)))
+
+
+class CBC(Mode):
+    """Cipher block chaining: each plaintext block is XORed with the previous ciphertext"""
+
+    def __init__(self, cipher, iv, **kwargs):
+        super().__init__(cipher, **kwargs)
+        if len(iv) != self.block_size:
+            raise ValueError(f"IV must be {self.block_size} bytes")
+        self.iv = bytes(iv)
+        self._encrypt_prev = self._decrypt_prev = int.from_bytes(self.iv, "big")
+
+    def _encrypt_blocks(self, view):
+        bs = self.block_size
+        encrypt = self.cipher.encrypt_block
+        prev = self._encrypt_prev
+        out = []
+        for block in self._blocks(view):
+            ciphertext = encrypt((int.from_bytes(block, "big") ^ prev).to_bytes(bs, "big"))
+            prev = int.from_bytes(ciphertext, "big")
+            out.append(ciphertext)
+        self._encrypt_prev = prev
+        return b"".join(out)
+
+    def _decrypt_blocks(self, view):
+        bs = self.block_size
+        decrypt = self.cipher.decrypt_block
+        prev = self._decrypt_prev
+        out = []
+        for block in self._blocks(view):
+            plaintext = int.from_bytes(decrypt(block), "big") ^ prev
+            prev = int.from_bytes(block, "big")
+            out.append(plaintext.to_bytes(bs, "big"))
+        self._decrypt_prev = prev
+        return b"".join(out)
+
+
+class CTR(Mode):
+    """
+    Counter mode: XOR with the encryption of successive counter blocks, starting
+    at *nonce* (a whole block, or a shorter prefix followed by a zero counter).
+    The whole block is incremented as one big-endian integer. Encryption and
+    decryption are the same operation, and no padding is needed.
+    """
+
+    padding = False
+
+    def __init__(self, cipher, nonce, **kwargs):
+        super().__init__(cipher, **kwargs)
+        if len(nonce) > self.block_size:
+            raise ValueError(f"nonce must be at most {self.block_size} bytes")
+        self.nonce = bytes(nonce).ljust(self.block_size, b"\0")
+        self._counter = int.from_bytes(self.nonce, "big")
+
+    def keystream(self, n_blocks: int) -> bytes:
+        """The next *n_blocks* blocks of keystream (advancing the counter)"""
+        bs = self.block_size
+        modulus = 1 << (8 * bs)
+        encrypt = self.cipher.encrypt_block
+        start = self._counter
+        self._counter = (start + n_blocks) % modulus
+        return b"".join(
+            encrypt(((start + i) % modulus).to_bytes(bs, "big")) for i in range(n_blocks)
+        )
+
+    def _encrypt_blocks(self, view):
+        n = len(view)
+        if not n:
+            return b""
+        keystream = self.keystream(-(-n // self.block_size))[:n]
+        return (int.from_bytes(view, "big") ^ int.from_bytes(keystream, "big")).to_bytes(
+            n, "big"
+        )
+
+    # no padding, and the last chunk may end mid-block
+    _decrypt_blocks = _finish_encrypt = _finish_decrypt = _encrypt_blocks
+
+
+# per-process state of ParallelCTR workers
+_worker_cipher = None
+_worker_memory = {}
+
+
+def _init_worker(key, rows, cols, byte_size):
+    global _worker_cipher
+    _worker_cipher = _cipher.AES(key, rows=rows, cols=cols, byte_size=byte_size)
+    _release_worker_memory()
+
+
+def _release_worker_memory():
+    for memory in _worker_memory.values():
+        memory.close()
+    _worker_memory.clear()
+
+
+def _worker_segment(name):
+    """
+    The shared memory block *name*, attached once and kept for the tasks after.
+    A ParallelCTR only replaces its block when it needs a bigger one (unlinking
+    the old), so a new name means any held handle is stale: close it rather than
+    keep an unlinked segment mapped.
+    """
+    memory = _worker_memory.get(name)
+    if memory is None:
+        _release_worker_memory()
+        memory = _worker_memory[name] = shared_memory.SharedMemory(name=name)
+    return memory
+
+
+def _keystream_task(args):
+    name, start, offset, n_blocks = args
+    memory = _worker_segment(name)
+    bs = _worker_cipher.block_size
+    modulus = 1 << (8 * bs)
+    encrypt = _worker_cipher.encrypt_block
+    memory.buf[offset : offset + n_blocks * bs] = b"".join(
+        encrypt(((start + i) % modulus).to_bytes(bs, "big")) for i in range(n_blocks)
+    )
+
+
+class ParallelCTR(CTR):
+    """
+    :class:`CTR` with the keystream computed by *processes* worker processes (one
+    per CPU by default), each taking runs of *blocks_per_task* counters. Requests
+    shorter than two runs are done in this process.
+
+    Holds a process pool and a shared memory block until closed; use it as a
+    context manager.
+    """
+
+    def __init__(
+        self,
+        cipher,
+        nonce,
+        *,
+        processes=None,
+        blocks_per_task=4096,
+        buffer_size=PARALLEL_BUFFER_SIZE,
+        **kwargs,
+    ):
+        if not isinstance(cipher, _cipher.AES):
+            raise TypeError("ParallelCTR needs an AES cipher to hand to its workers")
+        super().__init__(cipher, nonce, buffer_size=buffer_size, **kwargs)
+        self.processes = processes
+        self.blocks_per_task = blocks_per_task
+        self._pool = None
+        self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def _start_pool(self):
+        schedule = self.cipher.schedule
+        self._pool = concurrent.futures.ProcessPoolExecutor(
+            self.processes,
+            initializer=_init_worker,
+            initargs=(schedule.key, schedule.rows, schedule.cols, schedule.byte_size),
+        )
+
+    def _shared(self, size):
+        if self._memory is None or self._memory.size < size:
+            if self._memory is not None:
+                self._memory.close()
+                self._memory.unlink()
+            self._memory = shared_memory.SharedMemory(create=True, size=size)
+        return self._memory
+
+    def keystream(self, n_blocks: int) -> bytes:
+        per_task = self.blocks_per_task
+        if n_blocks < 2 * per_task:
+            return super().keystream(n_blocks)
+        if self._pool is None:
+            self._start_pool()
+
+        bs = self.block_size
+        memory = self._shared(n_blocks * bs)
+        start = self._counter
+        self._counter = (start + n_blocks) % (1 << (8 * bs))
+        tasks = [
+            (memory.name, start + first, first * bs, min(per_task, n_blocks - first))
+            for first in range(0, n_blocks, per_task)
+        ]
+        for _ in self._pool.map(_keystream_task, tasks):
+            pass
+        return bytes(memory.buf[: n_blocks * bs])
@@ -1,7 +1,8 @@
+import array
 import math
 
 from dangercrypt import xtra
-import finite
+from dangercrypt.xtra import polymul
 
 
 AES_ROWS = 4
@@ -9,23 +10,34 @@ AES_COLS = 4
 AES_BYTE_SIZE = 8
 
 
+def _buffer(values, byte_size):
+    """A mutable buffer of *values*: a bytearray, or an array for wider bytes"""
+    if byte_size <= 8:
+        return bytearray(values)
+    return array.array(polymul.array_typecode(2 ** byte_size), values)
+
+
 class State:
     """
     FIPS 197 AES, sec. 3.4
 
         s[r, c]= in[r + 4c]   (aka iterate down the columns first)
 
+    ``bytes`` is a bytearray (an ``array.array`` for bytes wider than 8 bits) that
+    lives as long as the State: load each block into it with :meth:`load` rather
+    than making a new State, and take rows and columns as memoryviews of it.
     """
 
+    __slots__ = ("rows", "cols", "n_bytes", "byte_size", "bytes")
+
     def __init__(self, *, rows=AES_ROWS, cols=AES_COLS, byte_size=AES_BYTE_SIZE):
         self.rows = rows
         self.cols = cols
         self.n_bytes = rows * cols
-
-        self.bytes = list([0] * self.n_bytes)
-
         self.byte_size = byte_size
 
+        self.bytes = _buffer([0] * self.n_bytes, byte_size)
+
     @classmethod
     def from_sq_array(cls, input_):
         rows = cols = int(math.sqrt(len(input_)))
@@ -34,15 +46,37 @@ class State:
             raise ValueError("input array must be square")
 
         state = cls(rows=rows, cols=cols)
+        if isinstance(input_, bytearray):
+            state.bytes = input_  # adopt it, no copy
+        else:
+            state.load(input_)
+        return state
 
-        assert len(state.bytes) == len(input_)
+    def load(self, values) -> "State":
+        """Overwrite the state in place with *values* (``n_bytes`` of them)"""
+        if len(values) != self.n_bytes:
+            raise ValueError(f"expected {self.n_bytes} bytes, not {len(values)}")
+        if self.byte_size <= 8 and isinstance(values, (bytes, bytearray, memoryview)):
+            self.bytes[:] = values
+        else:
+            self.bytes[:] = _buffer(values, self.byte_size)
+        return self
 
-        state.bytes = list(input_)
-        return state
+    @property
+    def view(self) -> memoryview:
+        return memoryview(self.bytes)
+
+    def column(self, c: int) -> memoryview:
+        """Column *c* (one word), as a writable view"""
+        return self.view[self.rows * c : self.rows * (c + 1)]
+
+    def row(self, r: int) -> memoryview:
+        """Row *r*, as a writable strided view"""
+        return self.view[r :: self.rows]
+
+    def set_column(self, c: int, values) -> None:
+        self.bytes[self.rows * c : self.rows * (c + 1)] = _buffer(values, self.byte_size)
 
     @property
     def words(self):
-        return list(
-            xtra.bits.bytes_to_word(bb, self.byte_size)
-            for bb in xtra.itertools.chunks(self.bytes, self.rows)
-        )
+        return xtra.bits.bytes_to_words(self.bytes, self.byte_size, self.rows)
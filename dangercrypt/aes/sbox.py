@@ -1,32 +1,135 @@
+"""
+SubBytes: FIPS 197, sec. 5.1.1
+
+Each byte is replaced by its multiplicative inverse in GF(2^8) (0 maps to 0),
+then put through an affine transform over GF(2):
+
+    b'_i = b_i ^ b_(i+4) ^ b_(i+5) ^ b_(i+6) ^ b_(i+7) ^ c_i,   c = 0x63
+
+i.e. the byte XORed with four left-rotations of itself, and the constant. The
+whole map is computed once per (byte size, modulus) into forward and inverse
+tables, which also works for fields other than GF(2^8).
+"""
 import functools
-import operator
 
+import finite
+from dangercrypt.xtra import binpoly
 from dangercrypt.xtra import bits as xb
+from dangercrypt.aes.objects import State
+
+
+AES_CONSTANT = 0b01100011
+
+
+def _rotations(byte_size: int) -> tuple[int, ...]:
+    """
+    Rotations XORed together by the affine transform. AES uses 0-4 for bytes; for
+    other sizes take as many as that allows while keeping the transform
+    invertible, i.e. sum x^k coprime to x^byte_size + 1.
+    """
+    modulus = (1 << byte_size) | 1
+    for top in range(byte_size // 2, -1, -1):
+        circulant = (1 << (top + 1)) - 1
+        if binpoly.gcd(modulus, circulant) == 1:
+            return tuple(range(top + 1))
+    raise AssertionError("unreachable: the identity is always invertible")
+
+
+class SBox:
+    """
+    Forward and inverse substitution tables for GF(2^byte_size) modulo *mod_poly*
+    (default from ``finite.POLY_MIN_WEIGHT``, which for bytes is the AES one).
+    Get them through :func:`get_sbox`, which caches them.
+    """
+
+    def __init__(self, byte_size=8, mod_poly=None, constant=None):
+        self.byte_size = byte_size
+        self.field = finite.Field(2 ** byte_size, mod_poly)
+        if self.field.mod_poly is None:
+            raise ValueError(f"no modulus known for {self.field}")
+        self.constant = AES_CONSTANT & (self.field.n - 1) if constant is None else constant
+        self.rotations = _rotations(byte_size)
+
+        forward = [self.affine(0)] + [
+            self.affine(int(self.field.element(x).inverse()))
+            for x in range(1, self.field.n)
+        ]
+        inverse = [0] * self.field.n
+        for x, y in enumerate(forward):
+            inverse[y] = x
+
+        if byte_size <= 8:
+            # padded out for bytes.translate
+            padding = bytes(256 - self.field.n)
+            self.forward = bytes(forward) + padding
+            self.inverse = bytes(inverse) + padding
+        else:
+            self.forward = forward
+            self.inverse = inverse
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} over {self.field}>"
+
+    def affine(self, byte: int) -> int:
+        result = self.constant
+        for n in self.rotations:
+            result ^= xb.irol(byte, self.byte_size, n)
+        return result
+
+    def sub_planes(self, data: xb.BitSlice) -> xb.BitSlice:
+        """
+        SubBytes on bit-sliced bytes, computed rather than looked up: the field
+        inverse as a chain of plane multiplications, then the affine transform as
+        plane renumbering and XORs. Every operation covers all the bytes at once.
+        """
+        modulus = sum(c << k for k, c in enumerate(self.field.mod_poly))
+        inverted = data.inverse(modulus)
+        result = inverted
+        for n in self.rotations[1:]:
+            result ^= inverted.rotl(n)
+        return result.xor_const(self.constant)
+
+    def _apply(self, table, data):
+        if isinstance(data, State):
+            if isinstance(data.bytes, bytearray) and isinstance(table, bytes):
+                data.bytes[:] = data.bytes.translate(table)
+            else:
+                data.load(self._apply(table, data.bytes))
+            return data
+        if isinstance(table, bytes):
+            return bytes(data).translate(table)
+        return [table[b] for b in data]
+
+    def sub_bytes(self, data):
+        """
+        Substitute every byte of *data* in one pass. bytes-like input gives bytes (for
+        byte sizes up to 8, otherwise a list); a :class:`State` is updated in place.
+        """
+        return self._apply(self.forward, data)
+
+    def inv_sub_bytes(self, data):
+        return self._apply(self.inverse, data)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_sbox(byte_size, mod_poly):
+    return SBox(byte_size, None if mod_poly is None else list(mod_poly))
 
 
-c = 0b01100011
-shifts = [0, 4, 5, 6, 7]
-shifts_int = 0b11110001
+def get_sbox(byte_size=8, mod_poly=None) -> SBox:
+    # resolve the default modulus so both spellings share a cache entry
+    field = finite.Field(2 ** byte_size, mod_poly)
+    return _get_sbox(byte_size, None if field.mod_poly is None else tuple(field.mod_poly))
 
 
-# def sub_byte(b: list[int], nb=8):
-#     """
-#     """
-#     if not isinstance(b, list):
-#         bits_in = xb.byte_to_bits(b, nb)
-#     else:
-#         bits_in = b
-#     bits_out = [0] * nb
-#     for n in range(nb):
-#         bits = [bits_in[(n + s) % nb] for s in shifts] + [xb.extract_bit(c, n)]
-#         print(bits)
-#         bits_out[n] = functools.reduce(operator.xor, bits)
-#     return bits_out
+def sub_bytes(data, byte_size=8, mod_poly=None):
+    return get_sbox(byte_size, mod_poly).sub_bytes(data)
 
 
-def sub_byte(b: list[int], nb=8) -> list[int]:
-    row = xb.byte_to_bits(xb.iror(shifts_int, nb), nb)
+def inv_sub_bytes(data, byte_size=8, mod_poly=None):
+    return get_sbox(byte_size, mod_poly).inv_sub_bytes(data)
 
 
-# def sub_byte():
-#     pass
+def sub_byte(b: int, nb=8) -> list[int]:
+    """Substitute a single byte, returned as its bits (least significant first)"""
+    return xb.byte_to_bits(get_sbox(nb).forward[b], nb)
@@ -0,0 +1,238 @@
+"""
+Slugs: short, random-looking, reversible names for small integer IDs
+
+An ID of ``bits`` bits is put through a keyed permutation of all ``bits``-bit
+numbers and then written out in an alphabet, so consecutive IDs come out as
+unrelated strings and the slug length is fixed.
+
+The permutation is a Feistel network over the ID split into ``bits /
+byte_size`` small-field bytes (a nibble, by default). Each round XORs one half
+with a function of the other: output byte m is the XOR over input bytes j of
+S[x_j ^ k_rjm], with S the Rijndael-style S-box over GF(2^byte_size) (see
+:mod:`dangercrypt.aes.sbox`) and the round keys taken from an AES-CTR keystream
+under the codec key. With an odd byte count the halves differ by one byte and
+swap sizes every round, which is still invertible.
+
+For batches, nothing is done per ID in Python beyond splitting and joining:
+the IDs are split into one column of bytes per position, and every S-box lookup
+(with its round key folded in) is a ``bytes.translate`` of a whole column, and
+every XOR one big-int XOR. Alphabets with a power-of-two size are likewise
+mapped digit-column-wise with ``translate``.
+
+Obfuscation, not encryption: see the README.
+"""
+import array
+
+from dangercrypt.aes import cipher as _cipher
+from dangercrypt.aes import modes as _modes
+from dangercrypt.aes import sbox as _sbox
+from dangercrypt.xtra import bits as xb
+
+
+# Crockford's base 32: no I, L, O or U
+DEFAULT_ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+DEFAULT_ROUNDS = 8
+_INVALID = 0xFF
+
+
+def _xor_columns(columns, n):
+    """XOR equal-length byte strings together"""
+    total = 0
+    for column in columns:
+        total ^= int.from_bytes(column, "big")
+    return total.to_bytes(n, "big")
+
+
+class SlugCodec:
+    """
+    Reversible slugs for IDs in ``range(2 ** bits)`` under *key* (16, 24 or 32
+    bytes). *bits* must be a multiple of *byte_size* (at most 8), covering at
+    least two bytes; *mod_poly* picks the field (default as for
+    :func:`dangercrypt.aes.sbox.get_sbox`).
+
+    All per-key work (S-box tables with the round keys folded in, the alphabet
+    maps) happens here, so build a codec once and reuse it.
+    """
+
+    def __init__(
+        self,
+        key,
+        *,
+        bits=32,
+        alphabet=DEFAULT_ALPHABET,
+        byte_size=4,
+        mod_poly=None,
+        rounds=DEFAULT_ROUNDS,
+    ):
+        if not 1 <= byte_size <= 8:
+            raise ValueError("byte_size must be 1-8")
+        if bits % byte_size or bits < 2 * byte_size:
+            raise ValueError(f"bits must be a multiple of {byte_size}, and at least two bytes")
+        if len(set(alphabet)) != len(alphabet) or len(alphabet) < 2:
+            raise ValueError("alphabet must have at least two distinct characters")
+        if not alphabet.isascii():
+            raise ValueError("alphabet must be ASCII")
+
+        self.bits = bits
+        self.byte_size = byte_size
+        self.n_bytes = bits // byte_size
+        self.rounds = rounds
+        self.alphabet = alphabet
+        self.base = len(alphabet)
+        if self.base & (self.base - 1) == 0:
+            # digits are bit fields, split and joined like bytes
+            self._digit_bits = self.base.bit_length() - 1
+            self.length = -(-bits // self._digit_bits)
+        else:
+            self._digit_bits = None
+            self.length = 1
+            while self.base ** self.length < 1 << bits:
+                self.length += 1
+
+        box = _sbox.get_sbox(byte_size, mod_poly)
+        self._tables = self._round_tables(key, box.forward)
+
+        self._to_chars = alphabet.encode("ascii").ljust(256, b"\0")
+        from_chars = bytearray([_INVALID]) * 256
+        for digit, char in enumerate(alphabet.encode("ascii")):
+            from_chars[char] = digit
+        self._from_chars = bytes(from_chars)
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} {self.bits} bits, "
+            f"{self.length} chars of {self.alphabet!r}>"
+        )
+
+    def _half_sizes(self, round_):
+        """Byte counts of (left, right) going into round *round_*"""
+        left = self.n_bytes // 2
+        right = self.n_bytes - left
+        return (left, right) if round_ % 2 == 0 else (right, left)
+
+    def _round_tables(self, key, sbox):
+        """
+        ``tables[r][j][m]``: translate table for round *r*, from right byte j to
+        left byte m, i.e. S[v ^ k_rjm] for every v
+        """
+        needed = sum(
+            left * right for left, right in map(self._half_sizes, range(self.rounds))
+        )
+        keystream = _modes.CTR(_cipher.AES(key), b"slug").keystream(-(-needed // 16))
+        mask = (1 << self.byte_size) - 1
+        keys = iter(keystream)
+
+        tables = []
+        for round_ in range(self.rounds):
+            left, right = self._half_sizes(round_)
+            tables.append([
+                [
+                    bytes(sbox[v ^ k] for v in range(1 << self.byte_size)).ljust(256, b"\0")
+                    for k in (next(keys) & mask for _ in range(left))
+                ]
+                for _ in range(right)
+            ])
+        return tables
+
+    # -- the permutation, on columns of bytes -------------------------------------
+
+    def _split(self, ids):
+        ids = ids if isinstance(ids, array.array) else list(ids)
+        if ids and min(ids) < 0:
+            raise ValueError("IDs must be non-negative")
+        if ids and max(ids) >> self.bits:
+            raise ValueError(f"ID {max(ids)} does not fit in {self.bits} bits")
+        flat = xb.words_to_bytes(ids, self.byte_size, self.n_bytes)
+        return [bytes(flat[j :: self.n_bytes]) for j in range(self.n_bytes)]
+
+    def _join(self, columns, n):
+        flat = bytearray(n * self.n_bytes)
+        for j, column in enumerate(columns):
+            flat[j :: self.n_bytes] = column
+        return xb.bytes_to_words(flat, self.byte_size, self.n_bytes)
+
+    def _feistel(self, left, right, round_, n):
+        """``left ^ F_round(right)``"""
+        tables = self._tables[round_]
+        return [
+            _xor_columns(
+                [left[m]] + [column.translate(tables[j][m]) for j, column in enumerate(right)],
+                n,
+            )
+            for m in range(len(left))
+        ]
+
+    def permute_many(self, ids):
+        """The keyed permutation of each ID, as an array"""
+        n = len(ids)
+        columns = self._split(ids)
+        left, right = columns[: self.n_bytes // 2], columns[self.n_bytes // 2 :]
+        for round_ in range(self.rounds):
+            left, right = right, self._feistel(left, right, round_, n)
+        return self._join(left + right, n)
+
+    def unpermute_many(self, values):
+        n = len(values)
+        columns = self._split(values)
+        split = self._half_sizes(self.rounds)[0]
+        left, right = columns[:split], columns[split:]
+        for round_ in reversed(range(self.rounds)):
+            left, right = self._feistel(right, left, round_, n), left
+        return self._join(left + right, n)
+
+    # -- alphabet ------------------------------------------------------------
+
+    def _spell(self, values):
+        length = self.length
+        if self._digit_bits:
+            digits = xb.words_to_bytes(values, self._digit_bits, length)
+        else:
+            digits = bytearray(len(values) * length)
+            for position in range(length - 1, -1, -1):
+                digits[position::length] = bytes(v % self.base for v in values)
+                values = [v // self.base for v in values]
+        text = digits.translate(self._to_chars).decode("ascii")
+        return [text[i : i + length] for i in range(0, len(text), length)]
+
+    def _read(self, slugs):
+        length = self.length
+        if any(len(s) != length for s in slugs):
+            raise ValueError(f"slugs must be {length} characters")
+        try:
+            digits = "".join(slugs).encode("ascii").translate(self._from_chars)
+        except UnicodeEncodeError:
+            raise ValueError("slug has characters outside the alphabet") from None
+        if _INVALID in digits:
+            raise ValueError("slug has characters outside the alphabet")
+
+        if self._digit_bits:
+            values = xb.bytes_to_words(digits, self._digit_bits, length)
+        else:
+            values = [0] * len(slugs)
+            for position in range(length):
+                column = digits[position::length]
+                values = [v * self.base + d for v, d in zip(values, column)]
+        if values and max(values) >> self.bits:
+            raise ValueError("slug out of range")
+        return values
+
+    # -- public API ------------------------------------------------------------
+
+    def encode_many(self, ids) -> list[str]:
+        """Slugs for a sequence (or array) of IDs"""
+        if not len(ids):
+            return []
+        return self._spell(self.permute_many(ids))
+
+    def decode_many(self, slugs) -> array.array:
+        """IDs for a sequence of slugs; raises ValueError if any isn't valid"""
+        slugs = list(slugs)
+        if not slugs:
+            return array.array("Q")
+        return self.unpermute_many(self._read(slugs))
+
+    def encode(self, id_: int) -> str:
+        return self.encode_many([id_])[0]
+
+    def decode(self, slug: str) -> int:
+        return self.decode_many([slug])[0]
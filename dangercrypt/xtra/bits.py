@@ -1,8 +1,10 @@
 """
 Bit manipulation routines
 """
+import array
 import collections.abc
 import enum
+import sys
 
 
 class Bit(enum.IntEnum):
@@ -15,6 +17,17 @@ class Endian(enum.Enum):
     little = "little"
 
 
+_ENDIANS = {**{e: e for e in Endian}, **{e.value: e for e in Endian}}
+_BUFFERS = (bytes, bytearray, memoryview)
+
+
+def _endian(endian) -> Endian:
+    try:
+        return _ENDIANS[endian]
+    except (KeyError, TypeError):
+        return Endian(endian)
+
+
 def bytes_to_word(
     bytes_: collections.abc.Iterable[int],
     byte_size: int,
@@ -24,7 +37,10 @@ def bytes_to_word(
     """
     Convert arbitrarly-sized bytes to a word
     """
-    endian = Endian(endian)
+    endian = _endian(endian)
+
+    if byte_size == 8 and isinstance(bytes_, _BUFFERS):
+        return int.from_bytes(bytes_, endian.value)
 
     if endian is Endian.little:
         bytes_ = reversed(bytes_)
@@ -39,27 +55,335 @@ def bytes_to_word(
     return x
 
 
+def word_to_bytes(
+    word: int,
+    byte_size: int,
+    n_bytes: int,
+    *,
+    endian: Endian | str = Endian.big,
+) -> list[int]:
+    """Split *word* into *n_bytes* bytes of *byte_size* bits; inverse of :func:`bytes_to_word`"""
+    endian = _endian(endian)
+    if word >> (byte_size * n_bytes):
+        raise ValueError(f"word {word:#x} too wide for {n_bytes} bytes")
+
+    mask = (1 << byte_size) - 1
+    bytes_ = [(word >> (byte_size * k)) & mask for k in range(n_bytes)]
+    if endian is Endian.big:
+        bytes_.reverse()
+    return bytes_
+
+
+def _typecode(bits: int) -> str | None:
+    """Smallest unsigned array typecode holding *bits* bits, if there is one"""
+    for typecode in "BHILQ":
+        if bits <= 8 * array.array(typecode).itemsize:
+            return typecode
+    return None
+
+
+def _as_list(values):
+    return values if isinstance(values, list) else list(values)
+
+
+def bytes_to_words(
+    buffer,
+    byte_size: int,
+    word_bytes: int = 4,
+    *,
+    endian: Endian | str = Endian.big,
+):
+    """
+    Pack a whole buffer of *byte_size*-bit bytes (bytes, bytearray, an array, or
+    any sequence of ints) into words of *word_bytes* bytes each, as an
+    ``array.array`` (or a list if the words are wider than 64 bits).
+
+    8-bit bytes into 1/2/4/8-byte words go through ``array.frombytes``. Otherwise
+    words are built by merging neighbours pairwise, doubling their width each
+    pass, so the work is a few list comprehensions rather than a loop per byte.
+    """
+    endian = _endian(endian)
+    if len(buffer) % word_bytes:
+        raise ValueError(f"{len(buffer)} bytes is not a whole number of {word_bytes}-byte words")
+    word_size = byte_size * word_bytes
+    typecode = _typecode(word_size)
+
+    if (
+        byte_size == 8
+        and typecode
+        and array.array(typecode).itemsize == word_bytes
+        and isinstance(buffer, _BUFFERS)
+    ):
+        words = array.array(typecode)
+        words.frombytes(buffer)
+        if endian.value != sys.byteorder:
+            words.byteswap()
+        return words
+
+    values = _as_list(buffer)
+    if values and max(values) >> byte_size:
+        raise ValueError(f"byte {max(values)} too wide")
+
+    width = byte_size
+    group = 1
+    if endian is Endian.little:
+        # merge (low, high) pairs
+        while group * 2 <= word_bytes and word_bytes % (group * 2) == 0:
+            values = [lo | (hi << width) for lo, hi in zip(values[0::2], values[1::2])]
+            width *= 2
+            group *= 2
+    else:
+        while group * 2 <= word_bytes and word_bytes % (group * 2) == 0:
+            values = [(hi << width) | lo for hi, lo in zip(values[0::2], values[1::2])]
+            width *= 2
+            group *= 2
+    if group < word_bytes:
+        # odd number of groups per word: fold them in one position at a time
+        step = word_bytes // group
+        order = range(step) if endian is Endian.big else range(step - 1, -1, -1)
+        words = None
+        for i in order:
+            column = values[i::step]
+            words = column if words is None else [
+                (w << width) | v for w, v in zip(words, column)
+            ]
+        values = words
+    return array.array(typecode, values) if typecode else values
+
+
+def words_to_bytes(
+    words,
+    byte_size: int,
+    word_bytes: int = 4,
+    *,
+    endian: Endian | str = Endian.big,
+):
+    """
+    Split words into *word_bytes* bytes of *byte_size* bits each, the inverse of
+    :func:`bytes_to_words`. Returns a bytearray for bytes of 8 bits or fewer, else
+    an ``array.array``.
+    """
+    endian = _endian(endian)
+    word_size = byte_size * word_bytes
+    values = _as_list(words)
+    if values and max(values) >> word_size:
+        raise ValueError(f"word {max(values):#x} too wide")
+
+    if byte_size == 8 and (typecode := _typecode(word_size)):
+        if array.array(typecode).itemsize == word_bytes:
+            packed = array.array(typecode, values)
+            if endian.value != sys.byteorder:
+                packed.byteswap()
+            return bytearray(packed.tobytes())
+
+    # split in halves while the word splits evenly, then one word at a time
+    group = word_bytes
+    width = word_size
+    while group % 2 == 0:
+        width //= 2
+        group //= 2
+        mask = (1 << width) - 1
+        high = [w >> width for w in values]
+        low = [w & mask for w in values]
+        values = [0] * (2 * len(high))
+        if endian is Endian.big:
+            values[0::2], values[1::2] = high, low
+        else:
+            values[0::2], values[1::2] = low, high
+    if group > 1:
+        # odd number of bytes per group: peel them off one position at a time
+        mask = (1 << byte_size) - 1
+        split = [0] * (group * len(values))
+        for i in range(group):
+            shift = byte_size * (group - 1 - i if endian is Endian.big else i)
+            split[i::group] = [(w >> shift) & mask for w in values]
+        values = split
+
+    if byte_size <= 8:
+        return bytearray(values)
+    typecode = _typecode(byte_size)
+    return array.array(typecode, values) if typecode else values
+
+
+_BITS = (Bit.ZERO, Bit.ONE)
+
+
 def byte_to_bits(
     byte: int,
     byte_size: int,
 ) -> list[int]:
-    return [extract_bit(byte, n) for n in range(byte_size)]
+    return [_BITS[(byte >> n) & 1] for n in range(byte_size)]
 
 
 def extract_bit(
     byte: int,
     bit: int
 ) -> Bit:
-    return Bit(1 if byte & (1 << bit) else 0)
+    return _BITS[(byte >> bit) & 1]
+
+
+def iror(byte: int, byte_size: int, n: int = 1):
+    """Integer Rotate Right (by *n* bits)"""
+    n %= byte_size
+    return ((byte >> n) | (byte << (byte_size - n))) & ((1 << byte_size) - 1)
+
+
+def irol(byte: int, byte_size: int, n: int = 1):
+    """Integer Rotate Left (by *n* bits)"""
+    return iror(byte, byte_size, -n)
+
+
+# bytes.translate tables: byte -> ASCII "0"/"1" for bit k, and back to 1 << k
+_TO_ASCII = [bytes(0x30 | ((b >> k) & 1) for b in range(256)) for k in range(8)]
+_FROM_ASCII = [bytes(48) + bytes([0, 1 << k]) + bytes(206) for k in range(8)]
+
+
+class BitSlice:
+    """
+    *n* bytes of *byte_size* bits stored transposed, as *byte_size* bit planes:
+    ``planes[k]`` is an int whose bit i is bit k of byte i. A bitwise operation on
+    a plane is then one big-int operation for all n bytes at once, and rotating
+    every byte is just renumbering the planes.
+
+    Planes are built and taken apart through binary-string conversions (which
+    CPython does in linear time) and ``bytes.translate`` for bytes of up to 8
+    bits.
+    """
+
+    __slots__ = ("planes", "n", "byte_size")
+
+    def __init__(self, planes, n: int, byte_size: int):
+        if len(planes) != byte_size:
+            raise ValueError(f"need {byte_size} planes, not {len(planes)}")
+        self.planes = list(planes)
+        self.n = n
+        self.byte_size = byte_size
+
+    @classmethod
+    def frombytes(cls, buffer, byte_size: int = 8) -> "BitSlice":
+        """Transpose *buffer* (bytes-like, or a sequence of ints) into bit planes"""
+        n = len(buffer)
+        if byte_size <= 8 and isinstance(buffer, _BUFFERS):
+            if byte_size < 8 and n and max(buffer) >> byte_size:
+                raise ValueError(f"byte {max(buffer)} too wide")
+            # reversed, so byte 0 lands in the least significant bit
+            data = bytes(buffer)[::-1]
+            planes = [int(data.translate(_TO_ASCII[k]) or b"0", 2) for k in range(byte_size)]
+        else:
+            values = _as_list(buffer)
+            if values and max(values) >> byte_size:
+                raise ValueError(f"byte {max(values)} too wide")
+            planes = [
+                int("".join("1" if (b >> k) & 1 else "0" for b in reversed(values)) or "0", 2)
+                for k in range(byte_size)
+            ]
+        return cls(planes, n, byte_size)
+
+    def tobytes(self):
+        """Transpose back: a bytearray for bytes of up to 8 bits, else a list"""
+        n = self.n
+        if not n:
+            return bytearray() if self.byte_size <= 8 else []
+        if self.byte_size <= 8:
+            # each plane as "0"/"1" per byte, mapped to 0 or 1 << k and OR-ed in
+            # as a little-endian int, one byte per element
+            total = 0
+            for k, plane in enumerate(self.planes):
+                ascii_ = format(plane, f"0{n}b")[::-1].encode("ascii")
+                total |= int.from_bytes(ascii_.translate(_FROM_ASCII[k]), "little")
+            return bytearray(total.to_bytes(n, "little"))
+        values = [0] * n
+        for k, plane in enumerate(self.planes):
+            for i, bit in enumerate(reversed(format(plane, f"0{n}b"))):
+                if bit == "1":
+                    values[i] |= 1 << k
+        return values
+
+    @property
+    def mask(self) -> int:
+        """A plane with every byte's bit set"""
+        return (1 << self.n) - 1
+
+    def _new(self, planes):
+        return self.__class__(planes, self.n, self.byte_size)
+
+    def _check(self, other):
+        if (other.n, other.byte_size) != (self.n, self.byte_size):
+            raise ValueError("bit slices differ in shape")
+
+    def __eq__(self, other):
+        if not isinstance(other, BitSlice):
+            return NotImplemented
+        return (self.n, self.byte_size, self.planes) == (other.n, other.byte_size, other.planes)
+
+    def __xor__(self, other):
+        if isinstance(other, int):
+            return self.xor_const(other)
+        self._check(other)
+        return self._new([a ^ b for a, b in zip(self.planes, other.planes)])
+
+    def __and__(self, other):
+        self._check(other)
+        return self._new([a & b for a, b in zip(self.planes, other.planes)])
+
+    def __or__(self, other):
+        self._check(other)
+        return self._new([a | b for a, b in zip(self.planes, other.planes)])
+
+    def __invert__(self):
+        mask = self.mask
+        return self._new([p ^ mask for p in self.planes])
+
+    def xor_const(self, constant: int) -> "BitSlice":
+        """XOR every byte with *constant*"""
+        mask = self.mask
+        return self._new(
+            [p ^ mask if (constant >> k) & 1 else p for k, p in enumerate(self.planes)]
+        )
+
+    def rotl(self, n: int = 1) -> "BitSlice":
+        """Rotate every byte left by *n* bits"""
+        size = self.byte_size
+        return self._new([self.planes[(k - n) % size] for k in range(size)])
 
+    def rotr(self, n: int = 1) -> "BitSlice":
+        return self.rotl(-n)
 
-def iror(byte: int, byte_size: int):
-    """Integer Rotate Right"""
-    byte, carry = divmod(byte, 2)
-    return byte + (carry << (byte_size - 1))
+    def mul(self, other: "BitSlice", modulus: int) -> "BitSlice":
+        """
+        Bytewise product in GF(2^byte_size) modulo *modulus* (an int polynomial of
+        degree byte_size): schoolbook carry-less multiplication over the planes,
+        then folding the high planes down.
+        """
+        self._check(other)
+        size = self.byte_size
+        product = [0] * (2 * size - 1)
+        for i, a in enumerate(self.planes):
+            if a:
+                for j, b in enumerate(other.planes):
+                    product[i + j] ^= a & b
+        taps = [k for k in range(size) if (modulus >> k) & 1]
+        for top in range(2 * size - 2, size - 1, -1):
+            plane = product[top]
+            if plane:
+                for k in taps:
+                    product[top - size + k] ^= plane
+        return self._new(product[:size])
 
+    def square(self, modulus: int) -> "BitSlice":
+        return self.mul(self, modulus)
 
-def irol(byte: int, byte_size: int):
-    """Integer Rotate Left"""
-    carry, byte = divmod(byte << 1, 1 << byte_size)
-    return byte + (1 if carry else 0)
+    def inverse(self, modulus: int) -> "BitSlice":
+        """Bytewise inverse in GF(2^byte_size) (0 maps to 0), as x^(2^byte_size - 2)"""
+        result = None
+        base = self
+        exponent = (1 << self.byte_size) - 2
+        while exponent:
+            if exponent & 1:
+                result = base if result is None else result.mul(base, modulus)
+            exponent >>= 1
+            if exponent:
+                base = base.square(modulus)
+        if result is None:  # GF(2): 1/1 = 1
+            return self._new(self.planes)
+        return result
@@ -0,0 +1,178 @@
+"""
+Discrete logarithms in the multiplicative group of a :class:`finite.Field`
+
+Pohlig-Hellman splits the problem over the factorization of the order of the
+base into one log per prime q dividing it (q^e times, a base-q digit at a
+time), then puts the answers together by the CRT. Each of those logs is in a
+group of prime order q, solved by:
+
+* baby-step giant-step, with a dict of the ``ceil(sqrt(q))`` baby steps as
+  the index, for q up to ``BSGS_MAX_ORDER``
+* Pollard's rho (Floyd cycle finding over the usual three-way partition of the
+  group), in constant memory, above that
+
+so the cost is about sqrt of the largest prime factor of the order, rather
+than the order itself. Weak parameters have smooth orders (GF(2^16): 65535 =
+3 * 5 * 17 * 257), where that's nothing.
+"""
+import math
+import random
+
+from dangercrypt.xtra import primes
+
+
+# largest prime subgroup solved by baby-step giant-step; its table then has
+# sqrt(BSGS_MAX_ORDER) = 2^18 entries
+BSGS_MAX_ORDER = 1 << 36
+# fresh random starting points Pollard's rho gets before giving up
+RHO_ATTEMPTS = 16
+
+
+def element_order(element, group_order: int) -> int:
+    """
+    Multiplicative order of *element*, given the order of the group it's in
+    (``n - 1`` for the field GF(n))
+    """
+    if not element.value:
+        raise ValueError("zero has no multiplicative order")
+    order = group_order
+    for q, e in primes.factorize(group_order).items():
+        for _ in range(e):
+            if element ** (order // q) != element ** 0:
+                break
+            order //= q
+    return order
+
+
+def bsgs(base, target, order: int) -> int | None:
+    """
+    x in ``range(order)`` with ``base ** x == target`` by baby-step giant-step,
+    where *order* is a multiple of the order of *base*; None if there's none
+    """
+    m = math.isqrt(order - 1) + 1
+    baby = {}
+    step = base ** 0
+    for j in range(m):
+        baby.setdefault(step.value, j)
+        step = step * base
+
+    giant = base ** -m
+    gamma = target
+    for i in range(m):
+        j = baby.get(gamma.value)
+        if j is not None:
+            return (i * m + j) % order
+        gamma = gamma * giant
+    return None
+
+
+def rho(base, target, order: int, *, seed: int = 1) -> int | None:
+    """
+    x in ``range(order)`` with ``base ** x == target`` by Pollard's rho, where
+    *order* is the (prime) order of *base*; None if every attempt failed, which
+    for a target outside the subgroup is all of them
+    """
+    rng = random.Random(seed)
+
+    def step(x, a, b):
+        kind = x.value % 3
+        if kind == 0:
+            return x * base, (a + 1) % order, b
+        if kind == 1:
+            return x * x, 2 * a % order, 2 * b % order
+        return x * target, a, (b + 1) % order
+
+    for _ in range(RHO_ATTEMPTS):
+        a, b = rng.randrange(order), rng.randrange(order)
+        tortoise = hare = (base ** a * target ** b, a, b)
+        while True:
+            tortoise = step(*tortoise)
+            hare = step(*step(*hare))
+            if tortoise[0] == hare[0]:
+                break
+        # base^a1 target^b1 = base^a2 target^b2, so x (b1 - b2) = a2 - a1
+        _, a1, b1 = tortoise
+        _, a2, b2 = hare
+        db = (b1 - b2) % order
+        if db:
+            x = (a2 - a1) * pow(db, -1, order) % order
+            if base ** x == target:
+                return x
+    return None
+
+
+def _prime_order_log(base, target, q: int) -> int:
+    if q <= BSGS_MAX_ORDER:
+        x = bsgs(base, target, q)
+    else:
+        x = rho(base, target, q)
+    if x is None:
+        raise ValueError("target is not a power of the base")
+    return x
+
+
+def pohlig_hellman(base, target, order: int) -> int:
+    """
+    x in ``range(order)`` with ``base ** x == target``, where *order* is the
+    exact order of *base*. Raises ValueError if there's no such x.
+    """
+    if order == 1:
+        if target != base:
+            raise ValueError("target is not a power of the base")
+        return 0
+
+    x, modulus = 0, 1
+    for q, e in primes.factorize(order).items():
+        # log of target^(order/q^e) to the base base^(order/q^e), of order q^e,
+        # found a base-q digit at a time in the subgroup of order q
+        cofactor = order // q ** e
+        gamma = base ** (order // q)
+        base_qe = base ** cofactor
+        target_qe = target ** cofactor
+        x_q = 0
+        for k in range(e):
+            h_k = (base_qe ** -x_q * target_qe) ** (q ** (e - 1 - k))
+            x_q += _prime_order_log(gamma, h_k, q) * q ** k
+
+        # CRT: combine x mod modulus with x_q mod q^e
+        qe = q ** e
+        x += modulus * ((x_q - x) * pow(modulus, -1, qe) % qe)
+        modulus *= qe
+
+    if base ** x != target:
+        raise ValueError("target is not a power of the base")
+    return x
+
+
+def discrete_log(target, base=None) -> int:
+    """
+    The smallest x >= 0 with ``base ** x == target``, for non-zero elements of
+    the same :class:`finite.Field`. *base* defaults to ``Field.generator()``,
+    of which every non-zero element is a power.
+
+    Raises ValueError if *target* isn't a power of *base*.
+    """
+    field = target.field
+    if base is None:
+        base = field.generator()
+    if base.field != field:
+        raise ValueError("base and target are in different fields")
+    if not target.value or not base.value:
+        raise ValueError("zero has no discrete log")
+
+    tables = field.tables
+    if tables is not None:
+        # log_base(target) * log(base) = log(target) mod n - 1
+        _, log = tables
+        group_order = field.n - 1
+        log_base, log_target = log[base.value], log[target.value]
+        d = math.gcd(log_base, group_order)
+        if log_target % d:
+            raise ValueError("target is not a power of the base")
+        order = group_order // d
+        if order == 1:
+            return 0
+        return log_target // d * pow(log_base // d, -1, order) % order
+
+    order = element_order(base, field.n - 1)
+    return pohlig_hellman(base, target, order)
@@ -0,0 +1,186 @@
+"""
+Irreducibility and primitivity of polynomials over GF(p), and searching for them
+
+Polynomials are coefficient lists, lowest order first, like in ``finite``. Over
+GF(2) the work is handed to the int-packed routines in ``binpoly``.
+
+Rabin's test: a degree n polynomial f is irreducible iff x^(p^n) = x (mod f) and
+gcd(f, x^(p^(n/q)) - x) = 1 for every prime q dividing n.
+"""
+import concurrent.futures
+import itertools
+import random
+
+import finite
+from dangercrypt.xtra import binpoly
+from dangercrypt.xtra import polymul
+from dangercrypt.xtra import primes
+
+
+def _monic(poly, prime):
+    poly = [c % prime for c in poly]
+    finite.normalize(poly)
+    if poly == [0]:
+        return poly
+    scale = pow(poly[-1], -1, prime)
+    return [c * scale % prime for c in poly]
+
+
+def _to_int(poly):
+    return sum((c & 1) << k for k, c in enumerate(poly))
+
+
+def _frobenius_powers(poly, prime, stop):
+    """
+    x^(p^k) mod monic *poly*, for k = 0 ... *stop*
+
+    Over GF(p), (sum c_i x^i)^p = sum c_i x^(ip), so with the rows x^(ip) mod f
+    precomputed (Berlekamp's Q matrix) each step is a linear combination of rows,
+    done on rows packed by :func:`polymul.pack_slots`.
+    """
+    n = len(poly) - 1
+    slot = polymul.slot_bytes(n * (prime - 1) ** 2)
+    if slot is None:
+        raise ValueError("polynomial too large to pack")
+
+    # x^j mod f by repeated multiplication by x, keeping every p-th
+    tail = [(k, c) for k, c in enumerate(poly[:-1]) if c]
+    current = [1] + [0] * (n - 1)
+    rows = [polymul.pack_slots(current, slot)]
+    for j in range(1, (n - 1) * prime + 1):
+        top = current.pop()
+        current.insert(0, 0)
+        if top:
+            for k, c in tail:
+                current[k] = (current[k] - top * c) % prime
+        if j % prime == 0:
+            rows.append(polymul.pack_slots(current, slot))
+
+    x = finite.poly_mod([0, 1], poly, prime)
+    powers = [x]
+    h = finite.pad(x, n)
+    for _ in range(stop):
+        combined = sum(c * row for c, row in zip(h, rows) if c)
+        h = [c % prime for c in polymul.unpack_slots(combined, n, slot)]
+        powers.append(h[:])
+        finite.normalize(powers[-1])
+    return powers
+
+
+def is_irreducible(poly: finite.T_POLY, prime: int) -> bool:
+    """Rabin's irreducibility test for *poly* over GF(*prime*)"""
+    poly = _monic(poly, prime)
+    n = len(poly) - 1
+    if n < 1:
+        return False
+    if n == 1:
+        return True
+    if prime == 2:
+        return binpoly.is_irreducible(_to_int(poly))
+    if not poly[0]:
+        return False  # divisible by x
+
+    powers = _frobenius_powers(poly, prime, n)
+    x = powers[0]
+    for q in primes.factorize(n):
+        h = finite.poly_sub(powers[n // q], x, prime)
+        if finite.poly_gcd(poly, h, prime) != [1]:
+            return False
+    return powers[n] == x
+
+
+def is_primitive(poly: finite.T_POLY, prime: int) -> bool:
+    """
+    Whether *poly* is irreducible and x generates the multiplicative group of the
+    field it defines, i.e. x^((p^n - 1) / q) != 1 for every prime q dividing
+    p^n - 1.
+    """
+    if not is_irreducible(poly, prime):
+        return False
+    poly = _monic(poly, prime)
+    if not poly[0]:
+        return False  # c x: x is 0 in that field
+    n = len(poly) - 1
+    order = prime ** n - 1
+    cofactors = [order // q for q in primes.factorize(order)]
+
+    if prime == 2:
+        f = _to_int(poly)
+        return all(binpoly.powmod(0b10, c, f) != 1 for c in cofactors)
+    return all(finite.poly_powmod([0, 1], c, poly, prime) != [1] for c in cofactors)
+
+
+def _candidate(index, degree, prime):
+    """The *index*-th monic polynomial of *degree*, counting the lower coefficients base p"""
+    coeffs = []
+    for _ in range(degree):
+        index, c = divmod(index, prime)
+        coeffs.append(c)
+    return coeffs + [1]
+
+
+def _check(args):
+    poly, prime, primitive = args
+    test = is_primitive if primitive else is_irreducible
+    return test(poly, prime)
+
+
+def irreducible_polys(
+    degree: int,
+    prime: int,
+    *,
+    primitive: bool = False,
+    start: int = 0,
+    processes: int | None = 0,
+    chunksize: int = 64,
+):
+    """
+    Yield monic irreducible (or, with *primitive*, primitive) polynomials of
+    *degree* over GF(*prime*) in order of their lower coefficients read as a
+    base-p number, beginning at *start*.
+
+    With *processes* other than 0, candidates are tested in a process pool (of
+    that many workers, or one per CPU if ``None``); results come out in the same
+    order.
+    """
+    candidates = (
+        _candidate(index, degree, prime) for index in range(start, prime ** degree)
+    )
+    # a constant term of zero means x divides it (unless it's just x)
+    if degree > 1:
+        candidates = (c for c in candidates if c[0])
+    work = ((c, prime, primitive) for c in candidates)
+
+    if processes == 0:
+        for args in work:
+            if _check(args):
+                yield args[0]
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+        while True:
+            batch = list(itertools.islice(work, chunksize * 16))
+            if not batch:
+                return
+            for (poly, *_), ok in zip(batch, pool.map(_check, batch, chunksize=chunksize)):
+                if ok:
+                    yield poly
+
+
+def random_irreducible(
+    degree: int,
+    prime: int,
+    *,
+    primitive: bool = False,
+    rng: random.Random | None = None,
+) -> finite.T_POLY:
+    """
+    A uniformly random monic irreducible (or primitive) polynomial. About one in
+    *degree* monic polynomials is irreducible, so this takes O(degree) tries.
+    """
+    rng = rng or random.Random()
+    test = is_primitive if primitive else is_irreducible
+    while True:
+        poly = [rng.randrange(prime) for _ in range(degree)] + [1]
+        if test(poly, prime):
+            return poly
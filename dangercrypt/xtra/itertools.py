@@ -1,15 +1,23 @@
+import array
 import collections.abc
+import itertools
 
 
 NO_PAD = object()
 
+_BUFFERS = (bytes, bytearray, memoryview, array.array)
 
-def pumper(it: collections.abc.Iterator, n: int, *, pad=NO_PAD):
+
+def _check_n(n):
     if not isinstance(n, int):
         raise TypeError("n must be an integer")
     if n < 1:
         raise ValueError("n must be >= 1")
 
+
+def pumper(it: collections.abc.Iterator, n: int, *, pad=NO_PAD):
+    _check_n(n)
+
     first = True
 
     while n:
@@ -26,10 +34,78 @@ def pumper(it: collections.abc.Iterator, n: int, *, pad=NO_PAD):
             yield pad
 
 
-def chunks(it: collections.abc.Iterable, n: int, *, pad=NO_PAD):
+def _buffer_chunks(buffer, n, pad):
+    view = memoryview(buffer)
+    if view.ndim != 1:
+        view = view.cast("B")
+    whole = len(view) - len(view) % n
+    for i in range(0, whole, n):
+        yield view[i : i + n]
+    if whole < len(view):
+        tail = view[whole:]
+        if pad is NO_PAD:
+            yield tail
+        else:
+            padded = tail.tolist() + [pad] * (n - len(tail))
+            try:
+                padded = memoryview(array.array(view.format, padded))
+            except (TypeError, ValueError, OverflowError):
+                pass  # pad doesn't fit the buffer's item type (None, say): keep the list
+            yield padded
+
+
+def _sequence_chunks(seq, n, pad):
+    whole = len(seq) - len(seq) % n
+    for i in range(0, whole, n):
+        yield seq[i : i + n]
+    if whole < len(seq):
+        tail = seq[whole:]
+        if pad is not NO_PAD:
+            tail += type(tail)([pad]) * (n - len(tail))
+        yield tail
+
+
+def _iter_chunks(it, n, pad, out):
     it = iter(it)
     while True:
-        item = list(pumper(it, n, pad=pad))
-        if not item:
-            break
+        if out is None:
+            item = list(itertools.islice(it, n))
+            k = len(item)
+        else:
+            k = 0
+            for k, value in enumerate(itertools.islice(it, n), 1):
+                out[k - 1] = value
+            item = out
+        if not k:
+            return
+        if k < n:
+            if pad is NO_PAD:
+                yield item[:k]
+            else:
+                item[k:] = [pad] * (n - k)
+                yield item
+            return
         yield item
+
+
+def chunks(it: collections.abc.Iterable, n: int, *, pad=NO_PAD, out=None):
+    """
+    Split *it* into consecutive chunks of *n* items, the last possibly short (or
+    filled up with *pad*).
+
+    Nothing is copied for inputs that support it: buffers (bytes, bytearray,
+    memoryview, array) give memoryview slices, and lists and tuples give slices
+    of themselves. Other iterables are consumed with ``islice`` into lists, or,
+    if *out* (a mutable sequence of length *n*) is given, into *out*, which is
+    yielded again for every full chunk, so consume each before asking for the
+    next.
+    """
+    _check_n(n)
+    if out is None:
+        if isinstance(it, _BUFFERS):
+            return _buffer_chunks(it, n, pad)
+        if isinstance(it, (list, tuple)):
+            return _sequence_chunks(it, n, pad)
+    elif len(out) != n:
+        raise ValueError(f"out must have length {n}")
+    return _iter_chunks(it, n, pad, out)
@@ -1,5 +1,20 @@
+import functools
+import itertools
+import operator
 import warnings
 
+from dangercrypt.xtra import binpoly
+from dangercrypt.xtra import polystore
+from dangercrypt.xtra import primes
+
+
+AES_POLYNOMIAL = 0b1_0001_1011
+
+# widths up to this get a full product table (2^(2 * width) entries)
+PRODUCT_TABLE_MAX_WIDTH = 8
+# ... and up to this, exp/log tables
+LOG_TABLE_MAX_WIDTH = 16
+
 
 # fmt: off
 KNOWN_IRREDUCIBLE_POLYS = [
@@ -10,6 +25,7 @@ KNOWN_IRREDUCIBLE_POLYS = [
     355, 357, 361, 369, 375
 ]
 # fmt: on
+_KNOWN_IRREDUCIBLE_POLYS = frozenset(KNOWN_IRREDUCIBLE_POLYS)
 
 
 def ffadd(a, b):
@@ -19,18 +35,22 @@ def ffadd(a, b):
     return a ^ b
 
 
-def ffmul(a, b, polynomial=0b1_0001_1011):
+def ffmul(a, b, polynomial=AES_POLYNOMIAL):
     """
-    GF(2**n) multiplication via "Russian peasant multiplication"
+    GF(2**n) multiplication via "Russian peasant multiplication", where n is the
+    degree of *polynomial*
 
     Adapted from https://en.wikipedia.org/wiki/Finite_field_arithmetic#C_programming_example
     """
     if (
         polynomial < KNOWN_IRREDUCIBLE_POLYS[-1]
-        and polynomial not in KNOWN_IRREDUCIBLE_POLYS
+        and polynomial not in _KNOWN_IRREDUCIBLE_POLYS
     ):
         warnings.warn("using a known-reducible polynomial")
 
+    # the bit that overflows the field when shifted left (0x80 for GF(2^8))
+    high_bit = 1 << (polynomial.bit_length() - 2)
+
     p = 0
     while a and b:
         # if b is odd, then add the corresponding a to p (final product = sum of all
@@ -38,9 +58,10 @@ def ffmul(a, b, polynomial=0b1_0001_1011):
         if b & 1:
             p ^= a  # since we're in GF(2^m), addition is an XOR
 
-        # GF modulo: if a >= 128, then it will overflow when shifted left, so reduce
-        if a & 0x80:
-            # XOR with the primitive polynomial x^8 + x^4 + x^3 + x + 1 (0b1_0001_1011)
+        # GF modulo: if a has its high bit set, it will overflow when shifted left,
+        # so reduce
+        if a & high_bit:
+            # XOR with the polynomial, e.g. x^8 + x^4 + x^3 + x + 1 (0b1_0001_1011)
             # you can change it but it must be irreducible
             a = (a << 1) ^ polynomial
         else:
@@ -50,6 +71,129 @@ def ffmul(a, b, polynomial=0b1_0001_1011):
     return p
 
 
+class FFMultiplier:
+    """
+    Multiplication in GF(2^width) modulo *polynomial*, specialized by size:
+
+    * width <= ``PRODUCT_TABLE_MAX_WIDTH``: one lookup in a full product table
+      (64 KiB for bytes)
+    * width <= ``LOG_TABLE_MAX_WIDTH``: exp/log tables
+    * wider: carry-less multiply and reduce in ``binpoly``
+
+    Build them with :func:`ffmultiplier`, which caches them.
+    """
+
+    def __init__(self, width, polynomial):
+        if binpoly.degree(polynomial) != width:
+            raise ValueError(f"polynomial {polynomial:#x} does not have degree {width}")
+        if not binpoly.is_irreducible(polynomial):
+            raise ValueError(f"polynomial {polynomial:#x} is reducible")
+        self.width = width
+        self.polynomial = polynomial
+        self.size = 1 << width
+
+        self.product = None
+        self.exp = self.log = None
+        if width <= LOG_TABLE_MAX_WIDTH:
+            self.exp, self.log = self._log_tables()
+        if width <= PRODUCT_TABLE_MAX_WIDTH:
+            self.product = self._product_table()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} GF(2^{self.width}) mod {self.polynomial:#x}>"
+
+    def _product_table(self):
+        exp, log = self.exp, self.log
+        rows = [bytes(self.size)]
+        for a in range(1, self.size):
+            la = log[a]
+            rows.append(bytes([0] + [exp[la + log[b]] for b in range(1, self.size)]))
+        return b"".join(rows)
+
+    def _generator(self):
+        order = self.size - 1
+        cofactors = [order // q for q in primes.factorize(order)]
+        # 1 only passes when the group is trivial (width 1), where it's all there is
+        for g in range(1, self.size):
+            if all(binpoly.powmod(g, c, self.polynomial) != 1 for c in cofactors):
+                return g
+        raise ValueError("no generator")  # can't happen for irreducible polynomials
+
+    def _log_tables(self):
+        order = self.size - 1
+        g = self._generator()
+        exp = [0] * (2 * order)
+        log = [0] * self.size
+        x = 1
+        for k in range(order):
+            exp[k] = exp[k + order] = x
+            log[x] = k
+            x = binpoly.mulmod(x, g, self.polynomial)
+        return exp, log
+
+    def __call__(self, a, b):
+        if self.product is not None:
+            return self.product[(a << self.width) | b]
+        if self.exp is not None:
+            if not a or not b:
+                return 0
+            return self.exp[self.log[a] + self.log[b]]
+        return binpoly.mulmod(a, b, self.polynomial)
+
+    def row(self, b):
+        """Products of every field element with *b*, as a lookup table"""
+        if self.product is not None:
+            start = b * self.size  # multiplication commutes, so row b = column b
+            return self.product[start : start + self.size]
+        return [self(a, b) for a in range(self.size)]
+
+    def many(self, a, b):
+        """
+        Elementwise products of the sequences *a* and *b* (bytes, bytearrays, lists
+        of ints...), or of every item of *a* with the single int *b*. Returns bytes
+        for widths up to 8, otherwise a list.
+        """
+        if isinstance(b, int):
+            table = self.row(b)
+            if self.product is not None:
+                return bytes(a).translate(bytes(table) + bytes(256 - self.size))
+            return [table[x] for x in a]
+
+        if len(a) != len(b):
+            raise ValueError(f"mismatched lengths: {len(a)} and {len(b)}")
+        if self.product is not None:
+            indexes = map(operator.or_, map(operator.lshift, a, itertools.repeat(self.width)), b)
+            return bytes(map(self.product.__getitem__, indexes))
+        return list(map(self, a, b))
+
+
+def ffmultiplier(width=8, polynomial=None):
+    """
+    Cached :class:`FFMultiplier` for GF(2^width). Without a *polynomial*, uses the
+    AES one for bytes, otherwise the lowest-weight irreducible one from the
+    catalogue in ``data/``.
+    """
+    if polynomial is None:
+        if width == 8:
+            polynomial = AES_POLYNOMIAL
+        else:
+            coeffs = polystore.lookup(2, width)
+            if coeffs is None:
+                raise ValueError(f"no known irreducible polynomial of degree {width}")
+            polynomial = sum(c << k for k, c in enumerate(coeffs))
+    return _ffmultiplier(width, polynomial)
+
+
+@functools.lru_cache(maxsize=32)
+def _ffmultiplier(width, polynomial):
+    return FFMultiplier(width, polynomial)
+
+
+def ffmul_many(a, b, polynomial=AES_POLYNOMIAL):
+    """Batch :func:`ffmul` over sequences (or a sequence and an int); see FFMultiplier.many"""
+    return ffmultiplier(binpoly.degree(polynomial), polynomial).many(a, b)
+
+
 def pcadd(a: list[int], b: list[int]):
     return [ffadd(aa, bb) for aa, bb in zip(a, b)]
 
@@ -0,0 +1,207 @@
+"""
+Memory-mapped catalogue of irreducible polynomials
+
+The text tables in ``data/irreducible-polys`` are packed (by ``packer.py`` there)
+into one little-endian binary file so a single polynomial can be looked up
+without parsing anything else:
+
+    header    4s magic, u16 version, u16 section count
+    sections  per base field GF(q): u32 q, u32 min degree, u32 max degree,
+              u32 offset of the degree index, u32 offset of the defining
+              polynomial entry (0 if q is prime)
+    index     per section, a u32 entry offset for every degree from min to max
+              (0 if missing)
+    entries   u16 number of terms, then (u16 power, u16 coefficient) pairs
+
+Coefficients over GF(p^n) are the NTL-style vectors from the tables, packed
+into an integer base p the same way ``finite.Element`` packs them.
+"""
+import functools
+import mmap
+import os
+import pathlib
+import struct
+
+
+MAGIC = b"DCIP"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHH")
+SECTION = struct.Struct("<IIIII")
+OFFSET = struct.Struct("<I")
+COUNT = struct.Struct("<H")
+TERM = struct.Struct("<HH")
+
+DEFAULT_PATH = (
+    pathlib.Path(__file__).resolve().parents[2]
+    / "data"
+    / "irreducible-polys"
+    / "irreducible.bin"
+)
+
+
+def _entry(terms: dict[int, int]) -> bytes:
+    terms = {power: coeff for power, coeff in terms.items() if coeff}
+    return COUNT.pack(len(terms)) + b"".join(
+        TERM.pack(power, coeff) for power, coeff in sorted(terms.items())
+    )
+
+
+def write_store(path, catalogue, defining=None):
+    """
+    Write a store to *path*. *catalogue* maps each q to ``{degree: {power:
+    coeff}}``; *defining* optionally maps q (for prime powers) to the ``{power:
+    coeff}`` polynomial over GF(p) that builds GF(q).
+    """
+    defining = defining or {}
+    qs = sorted(catalogue)
+
+    sections = []
+    body = []
+    offset = HEADER.size + SECTION.size * len(qs)
+    for q in qs:
+        polys = catalogue[q]
+        degrees = range(min(polys), max(polys) + 1)
+        index_offset = offset
+        offset += OFFSET.size * len(degrees)
+
+        defining_offset = 0
+        defining_entry = b""
+        if q in defining:
+            defining_offset = offset
+            defining_entry = _entry(defining[q])
+            offset += len(defining_entry)
+
+        index = []
+        entries = []
+        for degree in degrees:
+            if degree not in polys:
+                index.append(0)
+                continue
+            index.append(offset)
+            entries.append(_entry(polys[degree]))
+            offset += len(entries[-1])
+
+        sections.append(
+            SECTION.pack(q, degrees.start, degrees.stop - 1, index_offset, defining_offset)
+        )
+        body.append(b"".join(OFFSET.pack(o) for o in index))
+        body.append(defining_entry)
+        body.extend(entries)
+
+    with open(path, mode="wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(qs)))
+        f.writelines(sections)
+        f.writelines(body)
+
+
+class PolyStore:
+    """
+    Read-only view of a store file. Lookups touch only the section table (read
+    once) and the requested entry, so they're O(1) regardless of file size.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = pathlib.Path(path)
+        with open(self.path, mode="rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n_sections = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a polynomial store")
+        if version != VERSION:
+            raise ValueError(f"unsupported polynomial store version {version}")
+
+        self._sections = {}
+        for k in range(n_sections):
+            q, *rest = SECTION.unpack_from(self._map, HEADER.size + k * SECTION.size)
+            self._sections[q] = tuple(rest)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {str(self.path)!r}>"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def __contains__(self, key):
+        q, degree = key
+        return self._entry_offset(q, degree) is not None
+
+    @property
+    def fields(self) -> list[int]:
+        return sorted(self._sections)
+
+    def degrees(self, q) -> range:
+        min_degree, max_degree, *_ = self._sections[q]
+        return range(min_degree, max_degree + 1)
+
+    def _entry_offset(self, q, degree):
+        try:
+            min_degree, max_degree, index_offset, _ = self._sections[q]
+        except KeyError:
+            return None
+        if not min_degree <= degree <= max_degree:
+            return None
+        position = index_offset + OFFSET.size * (degree - min_degree)
+        (offset,) = OFFSET.unpack_from(self._map, position)
+        return offset or None
+
+    def _read_terms(self, offset) -> dict[int, int]:
+        (count,) = COUNT.unpack_from(self._map, offset)
+        start = offset + COUNT.size
+        raw = self._map[start : start + count * TERM.size]
+        return dict(TERM.iter_unpack(raw))
+
+    def terms(self, q, degree) -> dict[int, int] | None:
+        """Nonzero terms ``{power: coeff}`` of the degree-*degree* polynomial over GF(q)"""
+        offset = self._entry_offset(q, degree)
+        if offset is None:
+            return None
+        return self._read_terms(offset)
+
+    def get(self, q, degree) -> list[int] | None:
+        """Coefficients (lowest order first) of the degree-*degree* polynomial over GF(q)"""
+        terms = self.terms(q, degree)
+        if terms is None:
+            return None
+        return _dense(terms, degree)
+
+    def defining_poly(self, q) -> list[int] | None:
+        """For q = p^n, the polynomial over GF(p) the table's GF(q) was built with"""
+        try:
+            *_, defining_offset = self._sections[q]
+        except KeyError:
+            return None
+        if not defining_offset:
+            return None
+        terms = self._read_terms(defining_offset)
+        return _dense(terms, max(terms))
+
+
+def _dense(terms, degree):
+    coeffs = [0] * (degree + 1)
+    for power, coeff in terms.items():
+        coeffs[power] = coeff
+    return coeffs
+
+
+@functools.cache
+def default_store() -> PolyStore | None:
+    """The store shipped in ``data/``, or ``None`` if it hasn't been built"""
+    if not os.path.exists(DEFAULT_PATH):
+        return None
+    return PolyStore(DEFAULT_PATH)
+
+
+def lookup(q, degree) -> list[int] | None:
+    """Irreducible polynomial of *degree* over GF(q) from the default store"""
+    store = default_store()
+    if store is None:
+        return None
+    return store.get(q, degree)
@@ -0,0 +1,147 @@
+"""
+Integer-only primality testing and factorization
+
+Trial division by a sieved table of small primes, then Miller-Rabin to spot
+primes and Pollard's rho (Brent's variant) to split whatever composite is left.
+That's plenty for group orders like 2^64 - 1 or 3^40 - 1.
+"""
+import bisect
+import collections
+import functools
+import math
+import random
+
+
+SIEVE_LIMIT = 1 << 16
+
+# Miller-Rabin with these bases is deterministic below 3.3 * 10^24
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MR_DETERMINISTIC_LIMIT = 3_317_044_064_679_887_385_961_981
+_MR_EXTRA_ROUNDS = 16
+
+
+def sieve(limit: int) -> list[int]:
+    """All primes below *limit*, by the sieve of Eratosthenes"""
+    if limit < 3:
+        return []
+    is_prime = bytearray([1]) * limit
+    is_prime[0] = is_prime[1] = 0
+    for k in range(2, math.isqrt(limit - 1) + 1):
+        if is_prime[k]:
+            is_prime[k * k :: k] = bytes(len(range(k * k, limit, k)))
+    return [k for k, flag in enumerate(is_prime) if flag]
+
+
+SMALL_PRIMES = sieve(SIEVE_LIMIT)
+
+
+def is_prime(n: int) -> bool:
+    """
+    Miller-Rabin primality test. Deterministic below 3.3 * 10^24; above that a
+    composite slips through with probability under 4^-(13 + 16).
+    """
+    if n < 2:
+        return False
+    if n < SIEVE_LIMIT:
+        index = bisect.bisect_left(SMALL_PRIMES, n)
+        return index < len(SMALL_PRIMES) and SMALL_PRIMES[index] == n
+    for p in _MR_BASES:
+        if n % p == 0:
+            return False
+
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+
+    bases = list(_MR_BASES)
+    if n >= _MR_DETERMINISTIC_LIMIT:
+        rng = random.Random(n)
+        bases += [rng.randrange(2, n - 1) for _ in range(_MR_EXTRA_ROUNDS)]
+
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_rho(n: int, *, seed: int = 1) -> int:
+    """
+    A non-trivial factor of the composite *n* by Pollard's rho with Brent's cycle
+    detection, batching the gcds.
+    """
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(seed)
+    while True:
+        y = rng.randrange(1, n)
+        c = rng.randrange(1, n)
+        batch = 128
+        g = r = q = 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += batch
+            r *= 2
+        if g == n:
+            # batch overshot; back up and go one step at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def factorize(n: int) -> dict[int, int]:
+    """Prime factorization of *n* as ``{prime: exponent}``, in ascending order"""
+    # a fresh dict every time, so callers can't corrupt the cache
+    return dict(_factorize(n))
+
+
+@functools.lru_cache(maxsize=1024)
+def _factorize(n: int) -> tuple[tuple[int, int], ...]:
+    if n < 1:
+        raise ValueError("can only factor positive integers")
+
+    factors = collections.Counter()
+    for p in SMALL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] += 1
+            n //= p
+
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if m < SIEVE_LIMIT ** 2 or is_prime(m):
+            # no factors below SIEVE_LIMIT are left, so anything under its square
+            # is prime
+            factors[m] += 1
+            continue
+        d = pollard_rho(m)
+        pending += [d, m // d]
+
+    return tuple(sorted(factors.items()))
+
+
+def prime_factors(n: int) -> list[int]:
+    """Prime factors of *n* in ascending order, repeated per multiplicity"""
+    return [p for p, k in factorize(n).items() for _ in range(k)]
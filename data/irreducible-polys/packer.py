@@ -4,9 +4,13 @@ import pathlib
 import sys
 
 
-PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 27]
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+PRIME_POWERS = {4: 2, 8: 2, 9: 3, 16: 2, 25: 5, 27: 3}
 THIS_DIR = pathlib.Path(__file__).parent
 
+sys.path.insert(0, str(THIS_DIR.parents[1]))
+from dangercrypt.xtra import polystore  # noqa: E402
+
 
 def find_path(n):
     matches = list(THIS_DIR.glob(f"F{n}-*.txt"))
@@ -21,9 +25,7 @@ def find_path(n):
 def process_line(line, format_):
     if format_ == 2:
         return process_line_2(line)
-    if format_ in PRIMES:
-        return process_line_prime(line)
-    return process_line_primepower(line)
+    return process_line_prime(line, PRIME_POWERS.get(format_, format_))
 
 
 def process_line_2(line):
@@ -31,10 +33,22 @@ def process_line_2(line):
     order, *others = powers
     dcoeffs = {o: 1 for o in others}
     dcoeffs[order] = 1
+    dcoeffs[0] = 1  # implicit in the table
     return order, dcoeffs
 
 
-def process_line_prime(line):
+def parse_coeff(text, prime):
+    """
+    A coefficient: an integer for prime fields, or an NTL vector like "[0 1 1]"
+    (lowest order first) for prime powers, which gets packed base *prime*.
+    """
+    if not text.startswith("["):
+        return int(text)
+    digits = [int(x) for x in text.strip("[]").split()]
+    return sum(d * prime ** k for k, d in enumerate(digits))
+
+
+def process_line_prime(line, prime):
     dcoeffs = {}
     order, other_coeffs = line.split(",", maxsplit=1)
     order = int(order)
@@ -43,12 +57,17 @@ def process_line_prime(line):
 
     for other_coeff in other_coeffs.strip().split(","):
         assert other_coeff[-1] == ")"
-        power, coeff = (int("0" + x) for x in other_coeff.rstrip(")").split("("))
-        dcoeffs[power] = coeff
+        power, coeff = other_coeff[:-1].split("(")
+        dcoeffs[int("0" + power)] = parse_coeff(coeff, prime)
 
     return order, dcoeffs
 
 
+def process_defining_line(line):
+    """The "[1 1 0 0 1]" header of prime power tables, as ``{power: coeff}``"""
+    return {k: c for k, c in enumerate(int(x) for x in line.strip("[]\n ").split())}
+
+
 def coeff_dict2list(dcoeffs, order=None):
     """convert dictionary of coefficients to list"""
     if order is None:
@@ -60,22 +79,57 @@ def coeff_dict2list(dcoeffs, order=None):
 
 
 def process_file(n):
+    """
+    Yield ``(order, {power: coeff})`` for every polynomial in the table for GF(*n*),
+    preceded by ``(None, {power: coeff})`` for the defining polynomial if *n* is a
+    prime power.
+    """
     path = find_path(n)
-    for x, line in enumerate(open(path, mode="r")):
-        yield process_line(line, n)
-        # yield coeff_dict2list(poly, order=order)
+    with open(path, mode="r") as f:
+        for x, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            if x == 0 and n in PRIME_POWERS:
+                yield None, process_defining_line(line)
+                continue
+            yield process_line(line, n)
+
+
+def load_all():
+    catalogue = {}
+    defining = {}
+    for n in PRIMES + sorted(PRIME_POWERS):
+        polys = {}
+        for order, dcoeffs in process_file(n):
+            if order is None:
+                defining[n] = dcoeffs
+            else:
+                polys[order] = dcoeffs
+        catalogue[n] = polys
+    return catalogue, defining
 
 
 def main():
     parser = argparse.ArgumentParser()
-    # parser.add_argument("n", type=int)
+    parser.add_argument(
+        "--format",
+        choices=["binary", "json"],
+        default="binary",
+        help="binary (memory-mappable store read by dangercrypt.xtra.polystore) or json",
+    )
+    parser.add_argument("--output", type=pathlib.Path)
     args = parser.parse_args()
 
-    data = {}
-    for p in PRIMES[:-1]:
-        data[p] = dict(process_file(p))
+    catalogue, defining = load_all()
+
+    if args.format == "binary":
+        output = args.output or polystore.DEFAULT_PATH
+        polystore.write_store(output, catalogue, defining)
+        return
 
-    with open("data.json", mode="w") as f:
+    data = {n: polys for n, polys in catalogue.items() if n in PRIMES}
+    with open(args.output or "data.json", mode="w") as f:
         json.dump(data, f)
 
 
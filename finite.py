@@ -1,28 +1,24 @@
+import array
 import collections
-import math
+import functools
+import itertools
+import operator
+import threading
+
+from dangercrypt.xtra import binpoly
+from dangercrypt.xtra import polymul
+from dangercrypt.xtra import polystore
+from dangercrypt.xtra import primes
 
 
 T_POLY = list[int]
 
 
 def get_prime_factors(number):
-    # https://paulrohan.medium.com/111de56541f
-
-    prime_factors = []
-
-    while number % 2 == 0:
-        prime_factors.append(2)
-        number = number / 2
-
-    for i in range(3, int(math.sqrt(number)) + 1, 2):
-        while number % i == 0:
-            prime_factors.append(int(i))
-            number = number / i
-
-    if number > 2:
-        prime_factors.append(int(number))
-
-    return prime_factors
+    """Prime factors of *number*, ascending and repeated per multiplicity"""
+    if number < 2:
+        return []
+    return primes.prime_factors(number)
 
 
 UNICODE_SUPERSCRIPTS = {
@@ -56,7 +52,7 @@ POLY_MIN_WEIGHT = {
         3: [1, 1, 0, 1],
         4: [1, 1, 0, 0, 1],
         5: [1, 0, 1, 0, 0, 1],
-        6: [1, 0, 1, 0, 0, 0, 1],
+        6: [1, 1, 0, 0, 0, 0, 1],
         7: [1, 1, 0, 0, 0, 0, 0, 1],
         # 8: [1, 0, 1, 1, 1, 0, 0, 0, 1],  # from paper
         8: [1, 1, 0, 1, 1, 0, 0, 0, 1],  # AES
@@ -101,8 +97,63 @@ POLY_MIN_WEIGHT = {
     },
 }
 
+# fields where the root x of the POLY_MIN_WEIGHT modulus is a primitive element:
+# every polynomial from the paper is primitive, the AES one isn't (3 = x + 1 is
+# the usual generator there)
+X_IS_PRIMITIVE = {
+    (prime, power) for prime, polys in POLY_MIN_WEIGHT.items() for power in polys
+} - {(2, 8)}
+
+
+# largest field (number of elements) that gets exp/log tables built for it
+TABLE_MAX_ORDER = 1 << 16
+# above this many digits, Field.unpack splits the value in halves (divide and
+# conquer) rather than peeling off one digit at a time, which is quadratic
+UNPACK_SPLIT = 32
+
+# how many distinct fields the registry keeps alive; least recently used go first
+FIELD_CACHE_SIZE = 128
+
+
+class _Interned(type):
+    """
+    Metaclass that interns fields: asking for the same order and modulus again
+    hands back the same object (along with any tables it has built), so equal
+    fields are usually identical. The registry is an LRU bounded by
+    ``FIELD_CACHE_SIZE``.
+    """
+
+    def __init__(cls, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        cls._registry = collections.OrderedDict()
+        cls._registry_lock = threading.Lock()
+
+    def __call__(cls, n, mod_poly=None):
+        key = (n, None if mod_poly is None else tuple(mod_poly))
+        with cls._registry_lock:
+            field = cls._registry.get(key)
+            if field is not None:
+                cls._registry.move_to_end(key)
+                return field
+
+        field = super().__call__(n, mod_poly)
+
+        # Field(n) and Field(n, <its default modulus>) are the same field
+        resolved = (n, None if field.mod_poly is None else tuple(field.mod_poly))
+        with cls._registry_lock:
+            field = cls._registry.get(resolved, field)
+            cls._registry[key] = cls._registry[resolved] = field
+            cls._registry.move_to_end(resolved)
+            while len(cls._registry) > FIELD_CACHE_SIZE:
+                cls._registry.popitem(last=False)
+        return field
 
-class Field:
+    def cache_clear(cls):
+        with cls._registry_lock:
+            cls._registry.clear()
+
+
+class Field(metaclass=_Interned):
     def __init__(self, n, mod_poly=None):
         self.n = n
 
@@ -122,12 +173,13 @@ class Field:
                 try:
                     self.mod_poly = POLY_MIN_WEIGHT[self.prime][self.power]
                 except KeyError:
-                    self.mod_poly = None
-                    # raise Exception(
-                    #     f"don't know a primitive polynomial for GF({self.prime}{int2sup(self.power)})"
-                    # )
+                    # irreducible (but not necessarily primitive) polynomials from
+                    # the data/ catalogue; None if it doesn't go that high
+                    self.mod_poly = polystore.lookup(self.prime, self.power)
             else:
-                self.mod_poly = mod_poly
+                self.mod_poly = list(mod_poly)
+
+        self._place_values = [self.prime ** p for p in range(self.power)]
 
     def __repr__(self):
         if self.power == 1:
@@ -135,45 +187,251 @@ class Field:
         return f"{self.__class__.__name__}({self.prime}{int2sup(self.power)})"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, self.__class__):
             raise TypeError
-        return (self.prime, self.power) == (other.prime, other.power)
+        return (self.n, self.mod_poly) == (other.n, other.mod_poly)
+
+    def __hash__(self):
+        return hash(self.n)
+
+    def __reduce__(self):
+        # re-intern on unpickling rather than shipping (or duplicating) tables
+        return self.__class__, (self.n, self.mod_poly)
 
     def element(self, value):
         return Element(self, value)
 
     E = element
 
+    def array(self, values=()):
+        return FieldArray(self, values)
+
+    def matrix(self, rows):
+        return FieldMatrix(self, rows)
+
+    def pack(self, coeff):
+        """
+        Pack polynomial coefficients (lowest order first) into an integer. They're
+        reduced mod p, and there may be fewer of them than the field's power.
+        """
+        p = self.prime
+        return sum((c % p) * v for c, v in zip(coeff, self._place_values))
+
+    def unpack(self, value):
+        """Unpack an integer into its ``power`` coefficients (lowest order first)"""
+        if self.power > UNPACK_SPLIT:
+            return _split_digits(value, self.prime, self.power, self._split_places)
+        coeff = []
+        for _ in range(self.power):
+            value, coeff_n = divmod(value, self.prime)
+            coeff.append(coeff_n)
+        return coeff
+
+    def add(self, a, b):
+        """Add two packed elements, digit by digit mod p"""
+        p = self.prime
+        if p == 2:
+            return a ^ b
+        if self.power == 1:
+            return (a + b) % p
+        result = 0
+        for place in self._place_values:
+            a, da = divmod(a, p)
+            b, db = divmod(b, p)
+            result += (da + db) % p * place
+        return result
+
+    def sub(self, a, b):
+        """Subtract two packed elements, digit by digit mod p"""
+        p = self.prime
+        if p == 2:
+            return a ^ b
+        if self.power == 1:
+            return (a - b) % p
+        result = 0
+        for place in self._place_values:
+            a, da = divmod(a, p)
+            b, db = divmod(b, p)
+            result += (da - db) % p * place
+        return result
+
+    @functools.cached_property
+    def tables(self):
+        """
+        Exponent and logarithm tables ``(exp, log)`` with respect to a primitive
+        element of the field, built on first use. ``exp`` is doubled in length so
+        the sum of two logarithms can index it without reducing modulo n - 1.
+
+        ``None`` if the field is larger than ``TABLE_MAX_ORDER``, or if there's
+        no usable modulus (unknown, or not irreducible).
+        """
+        if self.n > TABLE_MAX_ORDER or self.mod_poly is None:
+            return None
+
+        generator = self._generator
+        if generator is None:
+            return None
+
+        order = self.n - 1
+        exp = [0] * (2 * order)
+        log = [0] * self.n
+        seen = [False] * self.n
+        power = self.element(1)
+        for k in range(order):
+            value = int(power)
+            if seen[value]:
+                # powers cycled early, so the modulus isn't irreducible
+                return None
+            seen[value] = True
+            exp[k] = exp[k + order] = value
+            log[value] = k
+            power = power._mul_generic(generator)
+        return exp, log
+
+    @functools.cached_property
+    def _split_places(self):
+        """``{n: p ** n}`` for every digit count :func:`_split_digits` halves at"""
+        places = {}
+        counts, seen = [self.power], set()
+        while counts:
+            n = counts.pop()
+            if n > UNPACK_SPLIT and n not in seen:
+                seen.add(n)
+                places[n // 2] = self.prime ** (n // 2)
+                counts += [n // 2, n - n // 2]
+        return places
+
+    @functools.cached_property
+    def reducer(self):
+        """:class:`PolyReducer` for the modulus, used by table-less multiplication"""
+        if self.mod_poly is None:
+            return None
+        return PolyReducer(self.mod_poly, self.prime)
+
+    @functools.cached_property
+    def zech(self):
+        """
+        Zech logarithms ``Z[k] = log(1 + g^k)`` (or -1 where ``1 + g^k = 0``), which
+        turn addition of two elements given by their logarithms into a lookup.
+        ``None`` when the field has no tables.
+        """
+        if self.tables is None:
+            return None
+        exp, log = self.tables
+        zech = []
+        for k in range(self.n - 1):
+            s = self.add(1, exp[k])
+            zech.append(log[s] if s else -1)
+        return zech
+
+    def generator(self):
+        """
+        A primitive element: every non-zero element is a power of it. Found once
+        per field (it's what the tables are built on). Raises ValueError if the
+        modulus is unknown or not irreducible.
+        """
+        generator = self._generator
+        if generator is None:
+            raise ValueError(f"{self} has no usable modulus to find a generator with")
+        return generator
+
+    def elements(self):
+        """
+        Every element of the field, in the order zero, then the powers g^0, g^1,
+        ..., g^(n-2) of :meth:`generator` (so the (k + 1)th element has log k).
+        Each one is a single multiplication (or table lookup) from the last.
+        """
+        generator = self.generator()
+        yield Element._new(self, 0)
+        tables = self.tables
+        if tables is not None:
+            for value in itertools.islice(tables[0], self.n - 1):
+                yield Element._new(self, value)
+            return
+        power = Element._new(self, 1)
+        for _ in range(self.n - 1):
+            yield power
+            power = power._mul_generic(generator)
+
+    @functools.cached_property
+    def _generator(self):
+        return None if self.mod_poly is None else self._find_generator()
+
+    def _find_generator(self):
+        """
+        Find a primitive element by checking that none of g^((n-1)/q) for the
+        prime factors q of n - 1 are 1 (and that g^(n-1) is, which only fails if
+        the modulus isn't irreducible). The root x of a modulus in
+        ``X_IS_PRIMITIVE`` is taken as it is, and tried first otherwise.
+        """
+        order = self.n - 1
+        if order == 1:
+            return self.element(1)
+        if (
+            (self.prime, self.power) in X_IS_PRIMITIVE
+            and self.mod_poly == POLY_MIN_WEIGHT[self.prime][self.power]
+        ):
+            return self.element(self.prime)
+
+        cofactors = [order // q for q in set(get_prime_factors(order))]
+        one = self.element(1)
+        candidates = range(2, self.n)
+        if self.power > 1:
+            candidates = itertools.chain([self.prime], candidates)
+        for candidate in candidates:
+            g = self.element(candidate)
+            if all(g._pow_generic(c) != one for c in cofactors):
+                if g._pow_generic(order) != one:
+                    return None
+                return g
+        return None
+
 
 class Element:
+    """
+    An element of a finite *field*, stored as a single integer *value* whose base-p
+    digits are the polynomial coefficients (lowest order first).
+    """
+
+    __slots__ = ("field", "value")
+
     def __init__(self, field, value):
         self.field = field
         if isinstance(value, int):
-            coeff = []
-            quotient = value
-            for _ in range(field.power):
-                quotient, coeff_n = divmod(quotient, field.prime)
-                coeff.append(coeff_n)
-            if quotient:
+            if not 0 <= value < field.n:
                 raise ValueError(f"{self.field} can not hold {value}")
         else:
-            coeff = value
-            coeff = [c % self.field.prime for c in coeff]
+            coeff = list(value)
             if len(coeff) != field.power:
                 raise ValueError(
                     f"number of coefficients: {len(coeff)} disagrees with field exponent: {field.power}"
                 )
+            value = field.pack(coeff)
 
-        self.coeff = coeff
+        self.value = value
+
+    @classmethod
+    def _new(cls, field, value):
+        """Skip validation for *value* already known to be in range"""
+        el = cls.__new__(cls)
+        el.field = field
+        el.value = value
+        return el
+
+    @property
+    def coeff(self):
+        return self.field.unpack(self.value)
 
     def __repr__(self):
         return f"<{self.__class__.__name__} in {self.field} coeff={self.coeff}>"
 
     def __add__(self, other):
-        new_coeff = [
-            (a + b) % self.field.prime for a, b in zip(self.coeff, other.coeff)
-        ]
-        return self.__class__(self.field, new_coeff)
+        if not isinstance(other, Element):
+            # let FieldArray/FieldMatrix broadcast
+            return NotImplemented
+        return self._new(self.field, self.field.add(self.value, other.value))
 
     def __radd__(self, other):
         if other == 0:
@@ -182,22 +440,28 @@ class Element:
         raise TypeError("unsupported")  # could probably support...
 
     def __sub__(self, other):
-        new_coeff = [
-            (a - b) % self.field.prime for a, b in zip(self.coeff, other.coeff)
-        ]
-        return self.__class__(self.field, new_coeff)
+        if not isinstance(other, Element):
+            return NotImplemented
+        return self._new(self.field, self.field.sub(self.value, other.value))
 
     def __neg__(self):
-        return self.__class__(self.field, 0) - self
+        return self._new(self.field, self.field.sub(0, self.value))
 
     def __int__(self):
-        return sum(c * self.field.prime ** p for p, c in enumerate(self.coeff))
+        return self.value
 
     def __eq__(self, other):
-        return self.field == other.field and self.coeff == other.coeff
+        return self.field == other.field and self.value == other.value
+
+    def __hash__(self):
+        return hash((self.field.n, self.value))
 
     def __divmod__(self, other):
-        quotient, remainder = poly_divmod(self.coeff, other.coeff)
+        """
+        Polynomial (not field) division of the coefficients. For the field quotient
+        use ``/``.
+        """
+        quotient, remainder = poly_divmod(self.coeff, other.coeff, self.field.prime)
 
         # re-pad remainder to same number of coefficients
         remainder = pad(remainder, self.field.power)
@@ -207,27 +471,545 @@ class Element:
         return quotient, self.__class__(self.field, remainder)
 
     def __truediv__(self, other):
-        return divmod(self, other)[0]
+        return self * other.inverse()
 
     def __mod__(self, other):
         return divmod(self, other)[1]
 
     def unreduced_mul(self, other):
-        result = [0] * (2 * self.field.power - 1)
-        for exp_a, coef_a in enumerate(self.coeff):
-            for exp_b, coef_b in enumerate(other.coeff):
-                result[exp_a + exp_b] += coef_a * coef_b
-        result = [n % self.field.prime for n in result]
-        return result
+        return polymul.mul(self.coeff, other.coeff, self.field.prime)
 
     def __mul__(self, other):
+        if not isinstance(other, Element):
+            return NotImplemented
+        tables = self.field.tables
+        if tables is None:
+            return self._mul_generic(other)
+        a, b = self.value, other.value
+        if not a or not b:
+            return self._new(self.field, 0)
+        exp, log = tables
+        return self._new(self.field, exp[log[a] + log[b]])
+
+    def __pow__(self, exponent):
+        if not isinstance(exponent, int):
+            return NotImplemented
+        a = self.value
+        if not a:
+            if exponent < 0:
+                raise ZeroDivisionError(f"zero has no inverse in {self.field}")
+            return self._new(self.field, 0 if exponent else 1)
+
+        # the multiplicative group has order n - 1, which also folds negative
+        # exponents into positive ones
+        exponent %= self.field.n - 1
+
+        tables = self.field.tables
+        if tables is None:
+            return self._pow_generic(exponent)
+        exp, log = tables
+        return self._new(self.field, exp[log[a] * exponent % (self.field.n - 1)])
+
+    def inverse(self):
+        """Multiplicative inverse"""
+        a = self.value
+        if not a:
+            raise ZeroDivisionError(f"zero has no inverse in {self.field}")
+
+        field = self.field
+        tables = field.tables
+        if tables is not None:
+            exp, log = tables
+            return self._new(field, exp[field.n - 1 - log[a]])
+        if field.power == 1:
+            return self._new(field, pow(a, -1, field.prime))
+        inv = poly_inverse(self.coeff, field.mod_poly, field.prime)
+        return self._new(field, field.pack(inv))
+
+    def _pow_generic(self, exponent):
+        """Square-and-multiply without using any tables"""
+        result = self._new(self.field, 1)
+        base = self
+        while exponent:
+            if exponent & 1:
+                result = result._mul_generic(base)
+            exponent >>= 1
+            if exponent:
+                base = base._mul_generic(base)
+        return result
+
+    def _mul_generic(self, other):
+        field = self.field
+        if field.power == 1:
+            return self._new(field, self.value * other.value % field.prime)
+        if field.prime == 2:
+            # packed values are already GF(2)[x] bit vectors
+            return self._new(field, binpoly.mulmod(self.value, other.value, field.reducer.binary))
         raw = self.unreduced_mul(other)
-        if self.field.power > 1:
-            _quotient, remainder = poly_divmod(raw, self.field.mod_poly)
-            remainder = pad(remainder, self.field.power)
+        return self._new(self.field, self.field.pack(self.field.reducer.reduce(raw)))
+
+
+class FieldArray:
+    """
+    A fixed-length vector of elements of *field*, kept as packed integers in an
+    :class:`array.array`. Arithmetic is elementwise against another FieldArray of
+    the same length, or broadcast against a single Element (or int).
+
+    Wherever it can, the work is done by lookup tables and C-level buffer
+    operations (``bytes.translate``, XOR of the whole buffer as one integer)
+    rather than by building Elements.
+    """
+
+    __slots__ = ("field", "values")
+
+    def __init__(self, field, values=()):
+        self.field = field
+        typecode = polymul.array_typecode(field.n)
+        if isinstance(values, array.array) and values.typecode == typecode:
+            values = array.array(typecode, values)
         else:
-            remainder = [raw[0] % self.field.prime]
-        return self.__class__(self.field, remainder)
+            values = array.array(typecode, map(int, values))
+        if values and max(values) >= field.n:
+            raise ValueError(f"{field} can not hold {max(values)}")
+        self.values = values
+
+    @classmethod
+    def _new(cls, field, values):
+        """Wrap an already-validated array (or iterable) without copying/checking"""
+        arr = cls.__new__(cls)
+        arr.field = field
+        if not isinstance(values, array.array):
+            values = array.array(polymul.array_typecode(field.n), values)
+        arr.values = values
+        return arr
+
+    @classmethod
+    def zeros(cls, field, length):
+        return cls._new(field, array.array(polymul.array_typecode(field.n), [0]) * length)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} in {self.field} values={self.values.tolist()}>"
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        field = self.field
+        return (Element._new(field, v) for v in self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._new(self.field, self.values[index])
+        return Element._new(self.field, self.values[index])
+
+    def __setitem__(self, index, value):
+        value = int(value)
+        if not 0 <= value < self.field.n:
+            raise ValueError(f"{self.field} can not hold {value}")
+        self.values[index] = value
+
+    def __eq__(self, other):
+        return self.field == other.field and self.values == other.values
+
+    def tolist(self):
+        return self.values.tolist()
+
+    # -- helpers ----------------------------------------------------------------
+
+    def _other_values(self, other):
+        """
+        Values of *other* lined up with this array's, or ``None`` if *other* is a
+        scalar (in which case use :meth:`_scalar`).
+        """
+        if isinstance(other, FieldArray):
+            if other.field != self.field:
+                raise ValueError(f"mismatched fields: {self.field} and {other.field}")
+            if len(other) != len(self):
+                raise ValueError(f"mismatched lengths: {len(self)} and {len(other)}")
+            return other.values
+        return None
+
+    def _scalar(self, other):
+        value = int(other)
+        if not 0 <= value < self.field.n:
+            raise ValueError(f"{self.field} can not hold {value}")
+        return value
+
+    def _map(self, func):
+        """
+        Apply *func* (packed value to packed value) to every value. Arrays at
+        least as long as the field tabulate it over the whole field first (then
+        a ``bytes.translate`` for bytes); for shorter ones, like matrix rows, that
+        would cost more than it saves, so it's called directly.
+        """
+        values = self.values
+        field = self.field
+        if len(values) < field.n:
+            return self._new(field, map(func, values))
+        if values.typecode == "B":
+            table = bytes(map(func, range(field.n))) + bytes(256 - field.n)
+            return self._new(field, array.array("B", values.tobytes().translate(table)))
+        table = list(map(func, range(field.n)))
+        return self._new(field, map(table.__getitem__, values))
+
+    def _xor(self, values):
+        """Characteristic 2 addition: one big-integer XOR over the raw buffers"""
+        a = int.from_bytes(self.values.tobytes(), "little")
+        b = int.from_bytes(values.tobytes(), "little")
+        result = array.array(self.values.typecode)
+        result.frombytes((a ^ b).to_bytes(len(self.values) * self.values.itemsize, "little"))
+        return self._new(self.field, result)
+
+    def _zipwith(self, values, func):
+        return self._new(self.field, map(func, self.values, values))
+
+    def _add_values(self, values):
+        field = self.field
+        p = field.prime
+        if p == 2:
+            return self._xor(values)
+        if field.power == 1:
+            return self._new(field, [(a + b) % p for a, b in zip(self.values, values)])
+
+        zech = field.zech
+        if zech is None:
+            return self._zipwith(values, field.add)
+        exp, log = field.tables
+        order = field.n - 1
+
+        def add(a, b):
+            if not a:
+                return b
+            if not b:
+                return a
+            la = log[a]
+            z = zech[(log[b] - la) % order]
+            return exp[la + z] if z >= 0 else 0
+
+        return self._zipwith(values, add)
+
+    def _neg_values(self):
+        field = self.field
+        if field.prime == 2:
+            return self.values
+        return array.array(self.values.typecode, (field.sub(0, a) for a in self.values))
+
+    # -- arithmetic -------------------------------------------------------------
+
+    def __add__(self, other):
+        values = self._other_values(other)
+        if values is None:
+            b = self._scalar(other)
+            return self._map(functools.partial(self.field.add, b))
+        return self._add_values(values)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return self._new(self.field, self._neg_values())
+
+    def __sub__(self, other):
+        values = self._other_values(other)
+        if values is None:
+            return self + self.field.sub(0, self._scalar(other))
+        return self._add_values(FieldArray._new(self.field, values)._neg_values())
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        field = self.field
+        values = self._other_values(other)
+        tables = field.tables
+
+        if values is None:
+            b = self._scalar(other)
+            if not b:
+                return self.zeros(field, len(self))
+            if tables is None:
+                el = Element._new(field, b)
+                return self._new(field, (int(Element._new(field, a)._mul_generic(el)) for a in self.values))
+            exp, log = tables
+            lb = log[b]
+            return self._map(lambda a: exp[log[a] + lb] if a else 0)
+
+        if tables is None:
+            return self._zipwith(
+                values,
+                lambda a, b: Element._new(field, a)._mul_generic(Element._new(field, b)).value,
+            )
+        exp, log = tables
+        return self._new(
+            field, [exp[log[a] + log[b]] if a and b else 0 for a, b in zip(self.values, values)]
+        )
+
+    __rmul__ = __mul__
+
+    def inverse(self):
+        """Elementwise multiplicative inverse"""
+        field = self.field
+        if 0 in self.values:
+            raise ZeroDivisionError(f"zero has no inverse in {field}")
+        if field.tables is None:
+            return self._new(field, (Element._new(field, a).inverse().value for a in self.values))
+        exp, log = field.tables
+        order = field.n - 1
+        return self._map(lambda a: exp[order - log[a]] if a else 0)
+
+    def __truediv__(self, other):
+        values = self._other_values(other)
+        if values is None:
+            return self * Element._new(self.field, self._scalar(other)).inverse()
+        return self * self._new(self.field, values).inverse()
+
+    def __pow__(self, exponent):
+        if not isinstance(exponent, int):
+            return NotImplemented
+        field = self.field
+        if field.tables is None:
+            return self._new(field, ((Element._new(field, a) ** exponent).value for a in self.values))
+        if exponent < 0:
+            return self.inverse() ** -exponent
+        exp, log = field.tables
+        order = field.n - 1
+        zero = 0 if exponent else 1
+        return self._map(lambda a: exp[log[a] * exponent % order] if a else zero)
+
+    # -- reductions -------------------------------------------------------------
+
+    def sum(self):
+        field = self.field
+        if field.prime == 2:
+            return Element._new(field, functools.reduce(operator.xor, self.values, 0))
+        if field.power == 1:
+            return Element._new(field, sum(self.values) % field.prime)
+        return Element._new(field, functools.reduce(field.add, self.values, 0))
+
+    def prod(self):
+        field = self.field
+        if 0 in self.values:
+            return Element._new(field, 0)
+        if field.tables is None:
+            return functools.reduce(operator.mul, self, Element._new(field, 1))
+        exp, log = field.tables
+        return Element._new(field, exp[sum(map(log.__getitem__, self.values)) % (field.n - 1)])
+
+    def dot(self, other):
+        return (self * other).sum()
+
+
+class FieldMatrix:
+    """
+    A matrix over *field*, given as a sequence of rows (each a sequence of ints
+    or Elements, all the same length), and kept as one :class:`FieldArray` per
+    row, so row operations (and products, done as combinations of rows) get
+    FieldArray's table and buffer fast paths.
+
+    ``@`` multiplies by another FieldMatrix or by a vector (a FieldArray, or a
+    sequence); ``*`` scales by an element.
+    """
+
+    __slots__ = ("field", "rows")
+
+    def __init__(self, field, rows):
+        self.field = field
+        self.rows = [FieldArray(field, row) for row in rows]
+        if len({len(row) for row in self.rows}) > 1:
+            raise ValueError("rows must all be the same length")
+
+    @classmethod
+    def _new(cls, field, rows):
+        """Wrap a list of FieldArrays without copying/checking"""
+        matrix = cls.__new__(cls)
+        matrix.field = field
+        matrix.rows = rows
+        return matrix
+
+    @classmethod
+    def zeros(cls, field, n_rows, n_cols):
+        return cls._new(field, [FieldArray.zeros(field, n_cols) for _ in range(n_rows)])
+
+    @classmethod
+    def identity(cls, field, size):
+        matrix = cls.zeros(field, size, size)
+        for k, row in enumerate(matrix.rows):
+            row.values[k] = 1
+        return matrix
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.rows), len(self.rows[0]) if self.rows else 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} in {self.field} rows={self.tolist()}>"
+
+    def __eq__(self, other):
+        return self.field == other.field and self.rows == other.rows
+
+    def __getitem__(self, index):
+        """``m[r, c]`` is an Element, ``m[r]`` the row (a FieldArray)"""
+        if isinstance(index, tuple):
+            r, c = index
+            return self.rows[r][c]
+        return self.rows[index]
+
+    def __setitem__(self, index, value):
+        r, c = index
+        self.rows[r][c] = value
+
+    def tolist(self):
+        return [row.tolist() for row in self.rows]
+
+    def copy(self):
+        return self._new(self.field, [row[:] for row in self.rows])
+
+    def transpose(self):
+        n_rows, n_cols = self.shape
+        flat = array.array(polymul.array_typecode(self.field.n))
+        for row in self.rows:
+            flat += row.values
+        return self._new(
+            self.field, [FieldArray._new(self.field, flat[c::n_cols]) for c in range(n_cols)]
+        )
+
+    # -- arithmetic -------------------------------------------------------------
+
+    def _check_shape(self, other):
+        if other.field != self.field:
+            raise ValueError(f"mismatched fields: {self.field} and {other.field}")
+        if other.shape != self.shape:
+            raise ValueError(f"mismatched shapes: {self.shape} and {other.shape}")
+
+    def __add__(self, other):
+        self._check_shape(other)
+        return self._new(self.field, [a + b for a, b in zip(self.rows, other.rows)])
+
+    def __sub__(self, other):
+        self._check_shape(other)
+        return self._new(self.field, [a - b for a, b in zip(self.rows, other.rows)])
+
+    def __neg__(self):
+        return self._new(self.field, [-row for row in self.rows])
+
+    def __mul__(self, other):
+        if isinstance(other, (FieldMatrix, FieldArray)):
+            return NotImplemented
+        return self._new(self.field, [row * other for row in self.rows])
+
+    __rmul__ = __mul__
+
+    def _combine(self, coeffs, rows, length):
+        """The linear combination of FieldArrays *rows* with scalars *coeffs*"""
+        total = FieldArray.zeros(self.field, length)
+        for coeff, row in zip(coeffs, rows):
+            if coeff:
+                total = total + (row if coeff == 1 else row * coeff)
+        return total
+
+    def __matmul__(self, other):
+        n_rows, n_cols = self.shape
+        if isinstance(other, FieldMatrix):
+            if other.field != self.field:
+                raise ValueError(f"mismatched fields: {self.field} and {other.field}")
+            if other.shape[0] != n_cols:
+                raise ValueError(f"can't multiply {self.shape} by {other.shape}")
+            length = other.shape[1]
+            return self._new(
+                self.field,
+                [self._combine(row.values, other.rows, length) for row in self.rows],
+            )
+
+        vector = other if isinstance(other, FieldArray) else FieldArray(self.field, other)
+        if len(vector) != n_cols:
+            raise ValueError(f"can't multiply {self.shape} by a vector of {len(vector)}")
+        return FieldArray._new(self.field, [row.dot(vector).value for row in self.rows])
+
+    def apply_columns(self, values):
+        """
+        Multiply every consecutive run of ``n_cols`` values in *values* (the
+        columns of a :class:`State`'s bytes, say) by this matrix, as one batch:
+        result row r is the combination of the strided slices ``values[k::n_cols]``
+        with the coefficients in row r, so each step is a FieldArray operation over
+        all the columns at once. Returns an array laid out like *values*.
+        """
+        n_rows, n_cols = self.shape
+        if len(values) % n_cols:
+            raise ValueError(f"{len(values)} values don't split into columns of {n_cols}")
+        typecode = polymul.array_typecode(self.field.n)
+        flat = array.array(typecode, values)
+        n_vectors = len(flat) // n_cols
+        slices = [FieldArray._new(self.field, flat[k::n_cols]) for k in range(n_cols)]
+
+        out = array.array(typecode, [0]) * (n_vectors * n_rows)
+        for r, row in enumerate(self.rows):
+            out[r::n_rows] = self._combine(row.values, slices, n_vectors).values
+        return out
+
+    # -- elimination ------------------------------------------------------------
+
+    def _eliminate(self, rows, n_cols):
+        """
+        Gauss-Jordan elimination of the FieldArrays *rows* in place, on their
+        first *n_cols* columns. Returns the pivot columns, and the determinant of
+        the eliminated part (meaningful if it's square and of full rank).
+        """
+        field = self.field
+        det = Element._new(field, 1)
+        pivots = []
+        for c in range(n_cols):
+            r = len(pivots)
+            if r == len(rows):
+                break
+            pivot = next((i for i in range(r, len(rows)) if rows[i].values[c]), None)
+            if pivot is None:
+                continue
+            if pivot != r:
+                rows[r], rows[pivot] = rows[pivot], rows[r]
+                det = -det
+            lead = rows[r][c]
+            det = det * lead
+            rows[r] = rows[r] * lead.inverse()
+            for i, row in enumerate(rows):
+                factor = row.values[c]
+                if i != r and factor:
+                    rows[i] = row - rows[r] * factor
+            pivots.append(c)
+        return pivots, det
+
+    def row_reduce(self):
+        """Reduced row echelon form, and the list of pivot columns"""
+        rows = list(self.rows)
+        pivots, _ = self._eliminate(rows, self.shape[1])
+        return self._new(self.field, rows), pivots
+
+    def rank(self) -> int:
+        return len(self.row_reduce()[1])
+
+    def _check_square(self):
+        if self.shape[0] != self.shape[1]:
+            raise ValueError(f"matrix is not square: {self.shape}")
+
+    def determinant(self) -> Element:
+        self._check_square()
+        size = self.shape[0]
+        pivots, det = self._eliminate(list(self.rows), size)
+        if len(pivots) < size:
+            return Element._new(self.field, 0)
+        return det
+
+    def inverse(self):
+        """Inverse by eliminating ``[self | I]``; ZeroDivisionError if singular"""
+        self._check_square()
+        size = self.shape[0]
+        identity = self.identity(self.field, size)
+        rows = [
+            FieldArray._new(self.field, row.values + unit.values)
+            for row, unit in zip(self.rows, identity.rows)
+        ]
+        pivots, _ = self._eliminate(rows, size)
+        if len(pivots) < size:
+            raise ZeroDivisionError("matrix is singular")
+        return self._new(self.field, [row[size:] for row in rows])
 
 
 def normalize(poly: T_POLY) -> None:
@@ -243,46 +1025,260 @@ def pad(poly: T_POLY, order: int) -> T_POLY:
     return poly + [0] * (order - len(poly))
 
 
-def poly_divmod(num: T_POLY, den: T_POLY) -> tuple[T_POLY, T_POLY]:
+def poly_mul(a: T_POLY, b: T_POLY, prime: int) -> T_POLY:
+    """Product of *a* and *b* over GF(*prime*)"""
+    result = polymul.mul([c % prime for c in a], [c % prime for c in b], prime)
+    normalize(result)
+    return result
+
+
+def poly_sub(a: T_POLY, b: T_POLY, prime: int) -> T_POLY:
+    """Difference *a* - *b* over GF(*prime*)"""
+    result = [(x - y) % prime for x, y in itertools.zip_longest(a, b, fillvalue=0)]
+    normalize(result)
+    return result
+
+
+def _divide(rem: T_POLY, den: T_POLY, prime: int, quotient=None) -> None:
+    """
+    Synthetic division of *rem* by normalized *den* over GF(*prime*), in place:
+    afterwards the low ``deg(den)`` coefficients of *rem* are the remainder (the
+    rest are zeroed). If given, *quotient* (at least ``len(rem) - deg(den)``
+    long) receives the quotient coefficients.
+
+    Only the inverse of den's leading coefficient is ever needed, and it's
+    computed once; the leading term is cancelled without arithmetic.
     """
-    Polynomial long division
+    deg_den = len(den) - 1
+    inv_lead = pow(den[-1], -1, prime)
+    tail = list(enumerate(den[:-1]))
+    for top in range(len(rem) - 1, deg_den - 1, -1):
+        mult = rem[top] * inv_lead % prime
+        rem[top] = 0
+        if quotient is not None:
+            quotient[top - deg_den] = mult
+        if mult:
+            shift = top - deg_den
+            for k, c in tail:
+                if c:
+                    rem[shift + k] = (rem[shift + k] - mult * c) % prime
+
+
+def _check_divisor(den: T_POLY, prime: int) -> T_POLY:
+    den = [c % prime for c in den]
+    normalize(den)
+    if den == [0]:
+        raise ZeroDivisionError("polynomial division by zero")
+    return den
+
+
+def poly_mod(num: T_POLY, den: T_POLY, prime: int) -> T_POLY:
+    """Remainder of *num* / *den* over GF(*prime*)"""
+    den = _check_divisor(den, prime)
+    rem = [c % prime for c in num]
+    _divide(rem, den, prime)
+    rem = rem[: len(den) - 1] or [0]
+    normalize(rem)
+    return rem
+
 
-    From http://stackoverflow.com/questions/26173058/division-of-polynomials-in-python
+def poly_gcd(a: T_POLY, b: T_POLY, prime: int) -> T_POLY:
+    """Monic greatest common divisor of *a* and *b* over GF(*prime*)"""
+    a = [c % prime for c in a]
+    b = [c % prime for c in b]
+    normalize(a)
+    normalize(b)
+    while b != [0]:
+        a, b = b, poly_mod(a, b, prime)
+    if a == [0]:
+        return a
+    scale = pow(a[-1], -1, prime)
+    return [c * scale % prime for c in a]
+
+
+def poly_powmod(base: T_POLY, exponent: int, mod_poly: T_POLY, prime: int) -> T_POLY:
+    """*base* to the *exponent* modulo *mod_poly* over GF(*prime*)"""
+    if exponent < 0:
+        raise ValueError("exponent must be non-negative")
+    result = poly_mod([1], mod_poly, prime)
+    base = poly_mod(base, mod_poly, prime)
+    while exponent:
+        if exponent & 1:
+            result = poly_mod(poly_mul(result, base, prime), mod_poly, prime)
+        exponent >>= 1
+        if exponent:
+            base = poly_mod(poly_mul(base, base, prime), mod_poly, prime)
+    return result
+
+
+def poly_inverse(poly: T_POLY, mod_poly: T_POLY, prime: int) -> T_POLY:
+    """
+    Inverse of *poly* modulo *mod_poly* over GF(*prime*), by the extended
+    Euclidean algorithm. Raises ZeroDivisionError if they aren't coprime.
+    """
+    # invariant: s_k * poly = r_k (mod mod_poly)
+    r0, r1 = mod_poly[:], [c % prime for c in poly]
+    normalize(r0)
+    normalize(r1)
+    s0, s1 = [0], [1]
+
+    while r1 != [0]:
+        # one step of long division r0 / r1, mod prime
+        quotient = [0] * max(len(r0) - len(r1) + 1, 1)
+        rem = r0[:]
+        _divide(rem, r1, prime, quotient)
+        normalize(rem)
+
+        # s_next = s0 - quotient * s1
+        prod = [0] * (len(quotient) + len(s1) - 1)
+        for i, q in enumerate(quotient):
+            for j, c in enumerate(s1):
+                prod[i + j] += q * c
+        s_next = [
+            (a - b) % prime
+            for a, b in itertools.zip_longest(s0, prod, fillvalue=0)
+        ]
+        normalize(s_next)
+
+        r0, r1 = r1, rem
+        s0, s1 = s1, s_next
+
+    if len(r0) != 1:
+        raise ZeroDivisionError("polynomial is not invertible modulo mod_poly")
+    # r0 is a nonzero constant; scale so the gcd is 1
+    scale = pow(r0[0], -1, prime)
+    return [c * scale % prime for c in s0]
+
+
+def poly_divmod(
+    num: T_POLY, den: T_POLY, prime: int | None = None
+) -> tuple[T_POLY, T_POLY]:
+    """
+    Polynomial long division, returning ``(quotient, remainder)``
 
     A polynomial is represented by a list of its coefficients, eg
     5*x**3 + 4*x**2 + 1 -> [1, 0, 4, 5]
 
-    Modified by PM 2Ring 2014.10.03
-    Modified by NickT to work with integers only
+    With *prime*, over GF(*prime*): exact, dividing by the leading coefficient of
+    *den* through its modular inverse. Without it, over the integers with
+    truncating division of the coefficients, which is only exact when that
+    leading coefficient divides everything it has to (e.g. it's 1).
+
+    Originally from http://stackoverflow.com/questions/26173058 (PM 2Ring,
+    NickT); now synthetic division in a single working copy.
     """
-    # Create normalized copies of the args
-    num = num[:]
-    normalize(num)
+    if prime is not None:
+        den = _check_divisor(den, prime)
+        rem = [c % prime for c in num]
+        normalize(rem)
+        if len(rem) < len(den):
+            return [0], rem
+        quotient = [0] * (len(rem) - len(den) + 1)
+        _divide(rem, den, prime, quotient)
+        rem = rem[: len(den) - 1] or [0]
+        normalize(rem)
+        return quotient, rem
+
+    rem = num[:]
+    normalize(rem)
     den = den[:]
     normalize(den)
+    if len(rem) < len(den):
+        return [0], rem
+
+    deg_den = len(den) - 1
+    lead = den[-1]
+    tail = list(enumerate(den[:-1]))
+    quotient = [0] * (len(rem) - deg_den)
+    for top in range(len(rem) - 1, deg_den - 1, -1):
+        mult = rem[top] // lead  # truncating division
+        quotient[top - deg_den] = mult
+        if mult:
+            shift = top - deg_den
+            for k, c in tail:
+                rem[shift + k] -= mult * c
+    rem = rem[:deg_den] or [0]
+    normalize(rem)
+    return quotient, rem
+
+
+def _split_digits(value, prime, n, places):
+    """The *n* lowest base-*prime* digits of *value*, using ``places[n // 2]``"""
+    if n <= UNPACK_SPLIT:
+        digits = []
+        for _ in range(n):
+            value, digit = divmod(value, prime)
+            digits.append(digit)
+        return digits
+    half = n // 2
+    high, low = divmod(value, places[half])
+    return _split_digits(low, prime, half, places) + _split_digits(high, prime, n - half, places)
+
+
+class PolyReducer:
+    """
+    Reduction modulo a fixed *mod_poly* over GF(*prime*), with everything that
+    only depends on the modulus done up front, Barrett-style: the rows
+    x^j mod f for deg f <= j <= 2 deg f - 2 are precomputed, so reducing a
+    product of two reduced polynomials is just a linear combination of rows,
+    without any division.
+
+    The rows are also packed (see :func:`polymul.pack_slots`), so that linear
+    combination runs as a few big-int multiply-adds.
+    """
+
+    def __init__(self, mod_poly: T_POLY, prime: int):
+        mod = _check_divisor(mod_poly, prime)
+        self.mod_poly = mod
+        self.prime = prime
+        self.degree = d = len(mod) - 1
+        # for GF(2), the modulus as a bit vector for binpoly
+        self.binary = sum(c << k for k, c in enumerate(mod)) if prime == 2 else None
+
+        # x^d = -(lower terms) / lead
+        inv_lead = pow(mod[-1], -1, prime)
+        tail = [-c * inv_lead % prime for c in mod[:-1]]
+        rows = []
+        current = tail
+        for _ in range(max(d - 1, 0)):
+            rows.append(current)
+            top = current[-1]
+            current = [0] + current[:-1]
+            if top:
+                current = [(a + top * t) % prime for a, t in zip(current, tail)]
+        self.rows = rows
+
+        # low part plus (d - 1) rows times a coefficient, before reducing mod p
+        self._slot = polymul.slot_bytes((prime - 1) + max(d - 1, 0) * (prime - 1) ** 2)
+        if self._slot:
+            self._packed = [polymul.pack_slots(row, self._slot) for row in rows]
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} mod {self.mod_poly} over GF({self.prime})>"
+
+    def reduce(self, poly: T_POLY) -> T_POLY:
+        """*poly* mod the modulus, as ``degree`` coefficients (not normalized)"""
+        p = self.prime
+        d = self.degree
+        if not d:
+            return []
+        poly = [c % p for c in poly]
+        if len(poly) > 2 * d - 1:
+            # too long for the rows: divide the top down first
+            _divide(poly, self.mod_poly, p)
+            del poly[2 * d - 1 :]
+        if len(poly) <= d:
+            return pad(poly, d)
+
+        low, high = poly[:d], poly[d:]
+        if self._slot:
+            combined = polymul.pack_slots(low, self._slot)
+            for c, row in zip(high, self._packed):
+                if c:
+                    combined += c * row
+            return [c % p for c in polymul.unpack_slots(combined, d, self._slot)]
 
-    if len(num) >= len(den):
-        # Shift den towards right so it's the same degree as num
-        shiftlen = len(num) - len(den)
-        den = [0] * shiftlen + den
-    else:
-        return [0], num
-
-    quotient = []
-    divisor = den[-1]  # removed float
-    for i in range(shiftlen + 1):
-        # Get the next coefficient of the quotient.
-        mult = num[-1] // divisor  # truncating division
-        quotient = [mult] + quotient
-
-        # Subtract mult * den from num, but don't bother if mult == 0
-        # Note that when i==0, mult!=0; so quot is automatically normalized.
-        if mult != 0:
-            d = [mult * u for u in den]
-            num = [u - v for u, v in zip(num, d)]
-
-        num.pop()
-        den.pop(0)
-
-    normalize(num)
-    return quotient, num
+        for c, row in zip(high, self.rows):
+            if c:
+                low = [a + c * r for a, r in zip(low, row)]
+        return [c % p for c in low]
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from dangercrypt.aes import cipher
+from dangercrypt.aes import State
+
+
+PLAINTEXT = bytes.fromhex("00112233445566778899aabbccddeeff")
+
+# FIPS 197 appendix C
+VECTORS = [
+    ("000102030405060708090a0b0c0d0e0f", "69c4e0d86a7b0430d8cdb78070b4c55a"),
+    (
+        "000102030405060708090a0b0c0d0e0f1011121314151617",
+        "dda97ca4864cdfe06eaf70a0ec0d7191",
+    ),
+    (
+        "000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f",
+        "8ea2b7ca516745bfeafc49904b496089",
+    ),
+]
+
+
+@pytest.mark.parametrize("fast", [True, False])
+@pytest.mark.parametrize("key, ciphertext", VECTORS)
+def test_fips_vectors(key, ciphertext, fast):
+    aes = cipher.AES(bytes.fromhex(key), fast=fast)
+    assert aes.encrypt_block(PLAINTEXT).hex() == ciphertext
+    assert aes.decrypt_block(bytes.fromhex(ciphertext)) == PLAINTEXT
+
+
+def test_mix_columns_state():
+    # FIPS 197 appendix B, round 1 after ShiftRows -> after MixColumns
+    state = State()
+    state.bytes[:] = bytes.fromhex("d4bf5d30e0b452aeb84111f11e2798e5")
+    cipher.mix_columns(state)
+    assert bytes(state.bytes).hex() == "046681e5e0cb199a48f8d37a2806264c"
+    cipher.mix_columns(state, inverse=True)
+    assert bytes(state.bytes).hex() == "d4bf5d30e0b452aeb84111f11e2798e5"
+
+
+@pytest.mark.parametrize("cols, key_size", [(4, 16), (5, 20), (6, 24), (7, 28), (8, 32)])
+def test_fast_matches_reference(cols, key_size):
+    rng = random.Random(cols)
+    key = rng.randbytes(key_size)
+    fast = cipher.AES(key, cols=cols, fast=True)
+    slow = cipher.AES(key, cols=cols, fast=False)
+    for _ in range(5):
+        block = rng.randbytes(4 * cols)
+        ciphertext = fast.encrypt_block(block)
+        assert ciphertext == slow.encrypt_block(block)
+        assert fast.decrypt_block(ciphertext) == block
+        assert slow.decrypt_block(ciphertext) == block
+
+
+@pytest.mark.parametrize("byte_size", [3, 4, 6, 10])
+def test_roundtrip_other_byte_sizes(byte_size):
+    rng = random.Random(byte_size)
+    key = [rng.randrange(2 ** byte_size) for _ in range(16)]
+    block = [rng.randrange(2 ** byte_size) for _ in range(16)]
+    aes = cipher.AES(key, byte_size=byte_size)
+    assert not aes.fast
+    ciphertext = aes.encrypt_block(block)
+    assert list(ciphertext) != block
+    assert list(aes.decrypt_block(ciphertext)) == block
+
+
+def test_bad_block():
+    aes = cipher.AES(bytes(16))
+    with pytest.raises(ValueError):
+        aes.encrypt_block(bytes(15))
+    with pytest.raises(ValueError):
+        cipher.AES(bytes(16), byte_size=4, fast=True)
@@ -0,0 +1,114 @@
+import random
+
+import pytest
+
+from dangercrypt.aes import cipher
+from dangercrypt.aes import keymixing
+from dangercrypt.aes.objects import State
+
+
+def test_expand_key():
+    # FIPS 197 appendix A.1
+    words = keymixing.expand_key(bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c"))
+    assert len(words) == 44
+    assert bytes(words[4]).hex() == "a0fafe17"
+    assert bytes(words[43]).hex() == "b6630ca6"
+
+
+def test_expand_key_256():
+    # FIPS 197 appendix A.3
+    key = bytes.fromhex(
+        "603deb1015ca71be2b73aef0857d77811f352c073b6108d72d9810a30914dff4"
+    )
+    words = keymixing.expand_key(key)
+    assert len(words) == 60
+    assert bytes(words[12]).hex() == "a8b09c1a"  # SubWord without RotWord
+    assert bytes(words[59]).hex() == "706c631e"
+
+
+def test_expand_key_bad_length():
+    with pytest.raises(ValueError):
+        keymixing.expand_key(bytes(15))
+
+
+def test_rcon():
+    assert [keymixing.rcon(i)[0] for i in range(1, 11)] == [
+        0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36,
+    ]
+
+
+def test_inverse_mix_poly():
+    _, forward, backward = keymixing.mix_polys(8)
+    assert forward == (0x02, 0x01, 0x01, 0x03)
+    assert backward == (0x0e, 0x09, 0x0d, 0x0b)
+
+
+def test_key_schedule_cached():
+    key = bytes(range(16))
+    schedule = keymixing.get_key_schedule(key)
+    assert keymixing.get_key_schedule(bytearray(key)) is schedule
+    assert keymixing.get_key_schedule(key, cols=6) is not schedule
+    assert schedule.rounds == 10
+    assert len(schedule.encryption) == 16 * 11
+
+
+def test_key_schedule_round_keys():
+    schedule = keymixing.KeySchedule(bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c"))
+    assert bytes(schedule.round_key(0)) == schedule.key
+    assert bytes(schedule.round_key(10)).hex() == "d014f9a8c9ee2589e13f0cc8b6630ca6"
+    # the decryption schedule starts with the last round key and ends with the key
+    assert schedule.round_key(0, decrypt=True) == schedule.round_key(10)
+    assert schedule.round_key(10, decrypt=True) == schedule.round_key(0)
+    for round_ in range(1, 10):
+        key = schedule.round_key(10 - round_)
+        mixed = [
+            b
+            for c in range(4)
+            for b in keymixing.mix_column(key[4 * c : 4 * c + 4], inverse=True)
+        ]
+        assert list(schedule.round_key(round_, decrypt=True)) == mixed
+    with pytest.raises(IndexError):
+        schedule.round_key(11)
+
+
+def test_key_schedule_read_only():
+    schedule = keymixing.get_key_schedule(bytes(16))
+    with pytest.raises(TypeError):
+        schedule.encryption[0] = 1
+
+
+def test_key_schedule_wide_bytes():
+    key = list(range(1000, 1016))
+    schedule = keymixing.get_key_schedule(key, byte_size=10)
+    assert keymixing.get_key_schedule(tuple(key), byte_size=10) is schedule
+    assert list(schedule.round_key(0)) == key
+    assert len(schedule.decryption) == len(schedule.encryption)
+
+
+@pytest.mark.parametrize("byte_size", [4, 8, 10])
+def test_mix_matrix(byte_size):
+    forward = keymixing.mix_matrix(byte_size)
+    backward = keymixing.mix_matrix(byte_size, inverse=True)
+    assert forward.determinant().value
+    assert forward.inverse() == backward
+
+    rng = random.Random(byte_size)
+    state = State(rows=4, cols=8, byte_size=byte_size)
+    state.load([rng.randrange(1 << byte_size) for _ in range(32)])
+    mixed = forward.apply_columns(state.bytes)
+    cipher.mix_columns(state)
+    assert list(mixed) == list(state.bytes)
+
+
+def test_mix_matrix_not_shared():
+    matrix = keymixing.mix_matrix()
+    matrix[0, 0] = 0
+    assert keymixing.mix_matrix()[0, 0].value == keymixing.MIX_POLY[0]
+
+
+def test_singular_mix_poly():
+    # {01}x^3 + {01}x^2 + {01}x + {01} is divisible by x + 1, so not invertible
+    field = keymixing.mix_matrix().field
+    ones = field.matrix([[1] * 4] * 4)
+    assert ones.rank() == 1
+    assert not ones.determinant().value
@@ -0,0 +1,146 @@
+import io
+import random
+from multiprocessing import shared_memory
+
+import pytest
+
+from dangercrypt.aes import cipher
+from dangercrypt.aes import modes
+
+
+# NIST SP 800-38A appendix F, AES-128
+KEY = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+PLAINTEXT = bytes.fromhex(
+    "6bc1bee22e409f96e93d7e117393172a"
+    "ae2d8a571e03ac9c9eb76fac45af8e51"
+    "30c81c46a35ce411e5fbc1191a0a52ef"
+    "f69f2445df4f9b17ad2b417be66c3710"
+)
+IV = bytes(range(16))
+COUNTER = bytes.fromhex("f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff")
+
+
+@pytest.mark.parametrize(
+    "make, ciphertext",
+    [
+        (
+            lambda aes: modes.ECB(aes, padding=False),
+            "3ad77bb40d7a3660a89ecaf32466ef97"
+            "f5d3d58503b9699de785895a96fdbaaf"
+            "43b1cd7f598ece23881b00e3ed030688"
+            "7b0c785e27e8ad3f8223207104725dd4",
+        ),
+        (
+            lambda aes: modes.CBC(aes, IV, padding=False),
+            "7649abac8119b246cee98e9b12e9197d"
+            "5086cb9b507219ee95db113a917678b2"
+            "73bed6b8e3c1743b7116e69e22229516"
+            "3ff1caa1681fac09120eca307586e1a7",
+        ),
+        (
+            lambda aes: modes.CTR(aes, COUNTER),
+            "874d6191b620e3261bef6864990db6ce"
+            "9806f66b7970fdff8617187bb9fffdff"
+            "5ae4df3edbd5d35e5b4f09020db03eab"
+            "1e031dda2fbe03d1792170a0f3009cee",
+        ),
+    ],
+)
+def test_sp800_38a(make, ciphertext):
+    aes = cipher.AES(KEY)
+    assert make(aes).encrypt(PLAINTEXT).hex() == ciphertext
+    assert make(aes).decrypt(bytes.fromhex(ciphertext)) == PLAINTEXT
+
+
+def test_padding():
+    assert modes.pad(b"abc", 4) == b"abc\x01"
+    assert modes.pad(b"abcd", 4) == b"abcd\x04\x04\x04\x04"
+    assert modes.unpad(b"abcd\x04\x04\x04\x04", 4) == b"abcd"
+    for bad in [b"abc\x00", b"ab\x01\x02", b"abc\x05", b"abc"]:
+        with pytest.raises(ValueError):
+            modes.unpad(bad, 4)
+
+
+MODES = [
+    lambda aes, **kw: modes.ECB(aes, **kw),
+    lambda aes, **kw: modes.CBC(aes, IV, **kw),
+    lambda aes, **kw: modes.CTR(aes, COUNTER[:8], **kw),
+]
+
+
+@pytest.mark.parametrize("make", MODES)
+@pytest.mark.parametrize("length", [0, 1, 15, 16, 17, 63, 64, 65, 200])
+def test_streaming_matches_whole(make, length):
+    aes = cipher.AES(KEY)
+    data = random.Random(length).randbytes(length)
+    whole = make(aes, buffer_size=1024).encrypt(data)
+
+    # small buffers, so the stream crosses many buffer boundaries
+    sink = io.BytesIO()
+    written = make(aes, buffer_size=32).encrypt(io.BytesIO(data), sink)
+    assert written == len(whole)
+    assert sink.getvalue() == whole
+
+    # ragged iterator input
+    pieces = [data[i : i + 7] for i in range(0, len(data), 7)]
+    assert make(aes, buffer_size=48).encrypt(iter(pieces)) == whole
+
+    for buffer_size in (32, 48, 1024):
+        assert make(aes, buffer_size=buffer_size).decrypt(io.BytesIO(whole)) == data
+
+
+def test_chunks_are_bounded():
+    aes = cipher.AES(KEY)
+    chunks = list(modes.CBC(aes, IV, buffer_size=64).iter_encrypt(bytes(1000)))
+    assert all(len(c) <= 64 + 16 for c in chunks)
+    assert sum(map(len, chunks)) == 1008
+
+
+def test_bad_arguments():
+    aes = cipher.AES(KEY)
+    with pytest.raises(ValueError):
+        modes.ECB(aes, buffer_size=40)
+    with pytest.raises(ValueError):
+        modes.CBC(aes, bytes(8))
+    with pytest.raises(ValueError):
+        modes.ECB(aes, padding=False).encrypt(bytes(17))
+    with pytest.raises(ValueError):
+        modes.CBC(aes, IV).decrypt(bytes(16))  # garbage padding
+    with pytest.raises(TypeError):
+        modes.ECB(aes).encrypt(42)
+
+
+def test_parallel_ctr():
+    aes = cipher.AES(KEY)
+    data = random.Random(0).randbytes(5000)
+    expected = modes.CTR(aes, COUNTER).encrypt(data)
+    with modes.ParallelCTR(
+        aes, COUNTER, processes=2, blocks_per_task=16, buffer_size=1024
+    ) as ctr:
+        assert ctr.encrypt(io.BytesIO(data)) == expected
+    with modes.ParallelCTR(aes, COUNTER, processes=2, blocks_per_task=16) as ctr:
+        assert ctr.decrypt(expected) == data
+
+
+def test_parallel_ctr_wraps():
+    aes = cipher.AES(KEY)
+    nonce = b"\xff" * 16
+    expected = modes.CTR(aes, nonce).keystream(64)
+    with modes.ParallelCTR(aes, nonce, processes=2, blocks_per_task=8) as ctr:
+        assert ctr.keystream(64) == expected
+
+
+def test_worker_segment_closes_stale_handles():
+    first = shared_memory.SharedMemory(create=True, size=64)
+    second = shared_memory.SharedMemory(create=True, size=128)
+    try:
+        held = modes._worker_segment(first.name)
+        assert modes._worker_segment(first.name) is held
+        modes._worker_segment(second.name)
+        assert held.buf is None  # closed
+        assert list(modes._worker_memory) == [second.name]
+    finally:
+        modes._release_worker_memory()
+        for memory in (first, second):
+            memory.close()
+            memory.unlink()
@@ -1,7 +1,9 @@
 import pytest
 
+import finite
 from dangercrypt.xtra import bits as xb
 from dangercrypt.aes import sbox
+from dangercrypt.aes import State
 
 
 @pytest.mark.parametrize(
@@ -16,3 +18,52 @@ from dangercrypt.aes import sbox
 )
 def test_sbox_basic(i, o):
     assert sbox.sub_byte(i) == xb.byte_to_bits(o, 8)
+
+
+def test_sbox_tables():
+    box = sbox.get_sbox()
+    assert box is sbox.get_sbox(8, finite.POLY_MIN_WEIGHT[2][8])
+    # FIPS 197 figure 7, first row
+    assert box.forward[:16] == bytes.fromhex("637c777bf26b6fc53001672bfed7ab76")
+    # figure 14, first row
+    assert box.inverse[:16] == bytes.fromhex("52096ad53036a538bf40a39e81f3d7fb")
+
+
+@pytest.mark.parametrize("byte_size", [3, 4, 5, 6, 7, 8, 9, 12])
+def test_sbox_is_permutation(byte_size):
+    box = sbox.get_sbox(byte_size)
+    n = 2 ** byte_size
+    assert sorted(box.forward[:n]) == list(range(n))
+    for x in range(n):
+        assert box.inverse[box.forward[x]] == x
+
+
+def test_sub_bytes():
+    data = bytes(range(256))
+    out = sbox.sub_bytes(data)
+    assert out == sbox.get_sbox().forward
+    assert sbox.inv_sub_bytes(out) == data
+
+
+def test_sub_bytes_state():
+    state = State.from_sq_array([0x00, 0x11, 0x22, 0x33] * 4)
+    assert sbox.sub_bytes(state) is state
+    assert list(state.bytes) == [0x63, 0x82, 0x93, 0xC3] * 4
+    sbox.inv_sub_bytes(state)
+    assert list(state.bytes) == [0x00, 0x11, 0x22, 0x33] * 4
+
+
+def test_sub_bytes_small_field():
+    box = sbox.get_sbox(4)
+    data = bytes(range(16))
+    assert sbox.inv_sub_bytes(sbox.sub_bytes(data, 4), 4) == data
+    assert box.sub_bytes(data) == box.forward[:16]
+
+
+@pytest.mark.parametrize("byte_size", [3, 4, 8, 9])
+def test_sub_planes_matches_table(byte_size):
+    box = sbox.get_sbox(byte_size)
+    n = 2 ** byte_size
+    values = list(range(n)) * 3
+    planes = xb.BitSlice.frombytes(values if byte_size > 8 else bytes(values), byte_size)
+    assert list(box.sub_planes(planes).tobytes()) == [box.forward[v] for v in values]
@@ -1,3 +1,5 @@
+import pytest
+
 from dangercrypt.aes import State
 
 
@@ -18,3 +20,47 @@ def test_words():
     assert s.words[1] == 0x04050607
     assert s.words[2] == 0x08090A0B
     assert s.words[3] == 0x0C0D0E0F
+
+
+def test_state_is_bytearray():
+    s = State()
+    assert isinstance(s.bytes, bytearray)
+    with pytest.raises(AttributeError):
+        s.extra = 1
+
+
+def test_state_from_bytearray_shares():
+    data = bytearray(range(16))
+    s = State.from_sq_array(data)
+    s.bytes[0] = 0xFF
+    assert data[0] == 0xFF
+
+
+def test_load_reuses_buffer():
+    s = State()
+    buffer = s.bytes
+    s.load(bytes(range(16)))
+    s.load(list(range(16, 32)))
+    assert s.bytes is buffer
+    assert s.bytes[0] == 16
+    with pytest.raises(ValueError):
+        s.load(bytes(15))
+
+
+def test_views():
+    s = State.from_sq_array(range(16))
+    assert bytes(s.column(1)) == bytes([4, 5, 6, 7])
+    assert bytes(s.row(1)) == bytes([1, 5, 9, 13])
+    s.row(1)[:] = bytes(4)
+    assert s.bytes[5] == 0
+    s.column(0)[0] = 0xAA
+    assert s.words[0] == 0xAA000203
+
+
+def test_wide_state():
+    s = State(byte_size=10)
+    s.load([1000 + n for n in range(16)])
+    assert list(s.column(0)) == [1000, 1001, 1002, 1003]
+    assert s.words[0] == (1000 << 30) | (1001 << 20) | (1002 << 10) | 1003
+    s.set_column(3, [1, 2, 3, 4])
+    assert list(s.row(0)) == [1000, 1004, 1008, 1]
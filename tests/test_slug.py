@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from dangercrypt import slug
+
+
+KEY = bytes(range(16))
+
+
+@pytest.fixture(scope="module")
+def codec():
+    return slug.SlugCodec(KEY)
+
+
+def test_roundtrip(codec):
+    ids = list(range(1000)) + [2 ** 32 - 1]
+    slugs = codec.encode_many(ids)
+    assert all(len(s) == codec.length == 7 for s in slugs)
+    assert len(set(slugs)) == len(slugs)
+    assert list(codec.decode_many(slugs)) == ids
+
+
+def test_single_matches_batch(codec):
+    slugs = codec.encode_many([5, 6, 7])
+    assert [codec.encode(i) for i in [5, 6, 7]] == slugs
+    assert codec.decode(slugs[1]) == 6
+
+
+def test_keyed(codec):
+    other = slug.SlugCodec(bytes(16))
+    assert codec.encode_many(range(10)) != other.encode_many(range(10))
+    assert slug.SlugCodec(KEY).encode_many(range(10)) == codec.encode_many(range(10))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(bits=8, byte_size=4),
+        dict(bits=12, byte_size=3, rounds=7),
+        dict(bits=15, byte_size=5, alphabet="0123456789"),
+        dict(bits=16, byte_size=8, alphabet="ab"),
+    ],
+)
+def test_permutation(kwargs):
+    codec = slug.SlugCodec(KEY, **kwargs)
+    everything = list(range(2 ** codec.bits))
+    permuted = codec.permute_many(everything)
+    assert sorted(permuted) == everything
+    assert list(codec.unpermute_many(permuted)) == everything
+    slugs = codec.encode_many(everything)
+    assert len(set(slugs)) == len(slugs)
+    assert list(codec.decode_many(slugs)) == everything
+
+
+def test_other_alphabet():
+    codec = slug.SlugCodec(KEY, bits=40, byte_size=5, alphabet="abcdefghijklmnopqrstuvwxyz")
+    assert codec.length == 9  # 26^9 > 2^40 > 26^8
+    ids = random.Random(0).sample(range(2 ** 40), 500)
+    slugs = codec.encode_many(ids)
+    assert all(set(s) <= set(codec.alphabet) for s in slugs)
+    assert list(codec.decode_many(slugs)) == ids
+
+
+def test_bad_input(codec):
+    with pytest.raises(ValueError):
+        codec.encode(2 ** 32)
+    with pytest.raises(ValueError):
+        codec.encode(-1)
+    with pytest.raises(ValueError, match="characters"):
+        codec.decode("abc")
+    with pytest.raises(ValueError, match="alphabet"):
+        codec.decode("iiiiiii")
+    with pytest.raises(ValueError, match="alphabet"):
+        codec.decode("ééééééé")
+    with pytest.raises(ValueError, match="range"):
+        codec.decode("zzzzzzz")  # 35 bits
+    with pytest.raises(ValueError):
+        slug.SlugCodec(KEY, bits=30, byte_size=4)
+    with pytest.raises(ValueError):
+        slug.SlugCodec(KEY, alphabet="aab")
+
+
+def test_empty(codec):
+    assert codec.encode_many([]) == []
+    assert list(codec.decode_many([])) == []
@@ -0,0 +1,147 @@
+import random
+import time
+
+import pytest
+
+import finite
+from dangercrypt.xtra import binpoly
+from dangercrypt.xtra.binpoly import BinaryPolynomial as BP
+
+
+AES_POLY = 0b1_0001_1011
+
+
+def naive_mul(a, b):
+    result = 0
+    for k in range(b.bit_length()):
+        if (b >> k) & 1:
+            result ^= a << k
+    return result
+
+
+def test_construction():
+    assert BP(0b1011) == BP([1, 1, 0, 1]) == 0b1011
+    assert BP(BP(5)).value == 5
+    assert BP(0b1011).coeff == [1, 1, 0, 1]
+    assert BP(0).degree == -1
+    assert BP(AES_POLY).degree == 8
+    with pytest.raises(ValueError):
+        BP(-1)
+
+
+def test_str():
+    assert str(BP(AES_POLY)) == "x^8 + x^4 + x^3 + x + 1"
+    assert str(BP(0)) == "0"
+
+
+def test_add_is_xor():
+    assert BP(0x57) + BP(0x83) == BP(0xD4)
+    assert BP(0x57) - 0x83 == 0xD4
+
+
+@pytest.mark.parametrize("bits", [1, 3, 8, 64, 500, 5000, 12000])
+def test_clmul(bits):
+    rng = random.Random(bits)
+    for _ in range(3):
+        a = rng.getrandbits(bits)
+        b = rng.getrandbits(bits)
+        assert binpoly.clmul(a, b) == naive_mul(a, b)
+        assert binpoly.square(a) == naive_mul(a, a)
+
+
+def test_karatsuba_matches_windowed():
+    rng = random.Random(0)
+    a = rng.getrandbits(3 * binpoly.KARATSUBA_THRESHOLD)
+    b = rng.getrandbits(2 * binpoly.KARATSUBA_THRESHOLD)
+    assert binpoly._karatsuba(a, b) == binpoly._windowed_mul(a, b)
+
+
+@pytest.mark.parametrize("bits", [8, 100, 3000])
+def test_divmod(bits):
+    rng = random.Random(bits)
+    for _ in range(10):
+        num = rng.getrandbits(2 * bits)
+        den = rng.getrandbits(bits) | 1
+        q, r = divmod(BP(num), BP(den))
+        assert r.degree < BP(den).degree
+        assert q * den + r == num
+
+
+def test_divide_by_zero():
+    with pytest.raises(ZeroDivisionError):
+        BP(5) % 0
+
+
+def test_gcd():
+    a = BP(0b111)  # x^2 + x + 1
+    b = BP(0b1011)  # x^3 + x + 1
+    c = BP(0b11)  # x + 1
+    assert (a * c).gcd(b * c) == c
+    assert a.gcd(b) == 1
+
+
+def test_aes_multiply():
+    # FIPS 197 section 4.2
+    assert binpoly.mulmod(0x57, 0x83, AES_POLY) == 0xC1
+    assert BP(0x57) * BP(0x13) % AES_POLY == 0xFE
+
+
+def test_matches_finite_field():
+    f = finite.Field(256)
+    for a in range(0, 256, 7):
+        for b in range(0, 256, 11):
+            assert binpoly.mulmod(a, b, AES_POLY) == int(f.element(a) * f.element(b))
+
+
+def test_powmod():
+    # x^(2^8 - 1) = 1 when x generates GF(2^8); 0x03 does with the AES poly
+    assert binpoly.powmod(0x03, 255, AES_POLY) == 1
+    assert pow(BP(0x03), 254, AES_POLY) * 0x03 % AES_POLY == 1
+    assert BP(0b10) ** 10 == 1 << 10
+
+
+def test_big_degree():
+    # x^9689 + x^84 + 1 is irreducible (data/irreducible-polys), so in the field
+    # it defines, x^(2^9689) = x
+    modulus = (1 << 9689) | (1 << 84) | 1
+    x = 0b10
+    assert binpoly.powmod(x, 1 << 9689, modulus) == x
+
+
+def test_sparse_mod_matches_divmod():
+    rng = random.Random(2)
+    modulus = (1 << 1000) | (1 << 37) | (1 << 5) | 1
+    for _ in range(10):
+        num = rng.getrandbits(2000)
+        assert binpoly.poly_mod(num, modulus) == binpoly.poly_divmod(num, modulus)[1]
+
+
+def test_dense_mod_matches_divmod():
+    rng = random.Random(3)
+    for degree in [64, 100, 1000]:
+        modulus = (1 << degree) | rng.getrandbits(degree)
+        for _ in range(10):
+            num = rng.getrandbits(rng.randrange(1, 3 * degree))
+            assert binpoly.poly_mod(num, modulus) == binpoly.poly_divmod(num, modulus)[1]
+
+
+def test_square_matches_clmul():
+    rng = random.Random(4)
+    for bits in [1, 8, 9, 1000]:
+        a = rng.getrandbits(bits)
+        assert binpoly.square(a) == binpoly.clmul(a, a)
+
+
+# the catalogue (data/irreducible-polys/F2-2to10000.txt) goes to degree 10000;
+# its x^9999 + x^2951 + 1 takes ~0.3 s here (it was ~8 s before reducing by
+# shifts for sparse moduli), so this budget has plenty of headroom
+IRREDUCIBLE_10K_BUDGET = 3.0
+
+
+def test_is_irreducible_degree_10000_budget():
+    modulus = (1 << 9999) | (1 << 2951) | 1
+    start = time.perf_counter()
+    assert binpoly.is_irreducible(modulus)
+    assert time.perf_counter() - start < IRREDUCIBLE_10K_BUDGET
+    # a neighbouring trinomial that isn't irreducible
+    assert not binpoly.is_irreducible((1 << 9999) | (1 << 2950) | 1)
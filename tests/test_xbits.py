@@ -1,6 +1,7 @@
 import pytest
 
 import dangercrypt.xtra.bits as xb
+import dangercrypt.xtra.math as xm
 
 
 @pytest.mark.parametrize(
@@ -25,6 +26,44 @@ def test_b2w_oversized():
         xb.bytes_to_word([0b1000], 3)
 
 
+@pytest.mark.parametrize("endian", ["big", "little"])
+@pytest.mark.parametrize("byte_size", [3, 4, 8, 10])
+def test_w2b_inverts_b2w(byte_size, endian):
+    bytes_ = [(5 * n + 1) % (1 << byte_size) for n in range(3)]
+    word = xb.bytes_to_word(bytes_, byte_size, endian=endian)
+    assert xb.word_to_bytes(word, byte_size, 3, endian=endian) == bytes_
+
+
+def test_w2b_oversized():
+    with pytest.raises(ValueError, match="too wide"):
+        xb.word_to_bytes(0x1FF, 4, 2)
+
+
+@pytest.mark.parametrize("endian", ["big", "little"])
+@pytest.mark.parametrize("word_bytes", [1, 2, 3, 4, 6, 8])
+@pytest.mark.parametrize("byte_size", [3, 4, 8, 12])
+def test_bulk_words(byte_size, word_bytes, endian):
+    bytes_ = [(7 * n + 3) % (1 << byte_size) for n in range(word_bytes * 5)]
+    buffer = bytes(bytes_) if byte_size <= 8 else bytes_
+    words = xb.bytes_to_words(buffer, byte_size, word_bytes, endian=endian)
+    assert list(words) == [
+        xb.bytes_to_word(bytes_[i : i + word_bytes], byte_size, endian=endian)
+        for i in range(0, len(bytes_), word_bytes)
+    ]
+    assert list(xb.words_to_bytes(words, byte_size, word_bytes, endian=endian)) == bytes_
+
+
+def test_bulk_words_types():
+    words = xb.bytes_to_words(bytes(range(8)), 8)
+    assert words.itemsize == 4
+    assert list(words) == [0x00010203, 0x04050607]
+    assert xb.words_to_bytes(words, 8) == bytearray(range(8))
+    with pytest.raises(ValueError, match="whole number"):
+        xb.bytes_to_words(bytes(7), 8)
+    with pytest.raises(ValueError, match="too wide"):
+        xb.bytes_to_words([0, 16], 4, 2)
+
+
 @pytest.mark.parametrize(
     "i, o",
     [
@@ -70,3 +109,54 @@ def test_iror(i, o):
 )
 def test_irol(i, o):
     assert xb.irol(**i) == o
+
+
+@pytest.mark.parametrize("byte_size", [3, 8, 32])
+@pytest.mark.parametrize("n", [0, 1, 2, 5])
+def test_rotate_n(byte_size, n):
+    byte = 0b101 % (1 << byte_size)
+    rotated = byte
+    for _ in range(n):
+        rotated = xb.iror(rotated, byte_size)
+    assert xb.iror(byte, byte_size, n) == rotated
+    assert xb.irol(rotated, byte_size, n) == byte
+
+
+@pytest.mark.parametrize("byte_size", [1, 3, 8, 12])
+@pytest.mark.parametrize("n", [0, 1, 9, 100])
+def test_bitslice_roundtrip(byte_size, n):
+    values = [(37 * i + 11) % (1 << byte_size) for i in range(n)]
+    buffer = bytes(values) if byte_size <= 8 else values
+    sliced = xb.BitSlice.frombytes(buffer, byte_size)
+    assert len(sliced.planes) == byte_size
+    assert list(sliced.tobytes()) == values
+
+
+def test_bitslice_planes():
+    sliced = xb.BitSlice.frombytes(bytes([0b01, 0b10, 0b11]), 2)
+    assert sliced.planes == [0b101, 0b110]
+
+
+def test_bitslice_ops():
+    a = bytes(range(0, 200, 3))
+    b = bytes(range(100, 167))
+    sa, sb = xb.BitSlice.frombytes(a), xb.BitSlice.frombytes(b)
+    assert bytes((sa ^ sb).tobytes()) == bytes(x ^ y for x, y in zip(a, b))
+    assert bytes((sa & sb).tobytes()) == bytes(x & y for x, y in zip(a, b))
+    assert bytes((sa | sb).tobytes()) == bytes(x | y for x, y in zip(a, b))
+    assert bytes((~sa).tobytes()) == bytes(x ^ 0xFF for x in a)
+    assert bytes((sa ^ 0x5A).tobytes()) == bytes(x ^ 0x5A for x in a)
+    assert bytes(sa.rotl(3).tobytes()) == bytes(xb.irol(x, 8, 3) for x in a)
+    assert bytes(sa.rotr(3).tobytes()) == bytes(xb.iror(x, 8, 3) for x in a)
+    with pytest.raises(ValueError):
+        sa ^ xb.BitSlice.frombytes(b[:-1])
+
+
+def test_bitslice_field():
+    a = bytes(range(256))
+    b = bytes(reversed(range(256)))
+    sa, sb = xb.BitSlice.frombytes(a), xb.BitSlice.frombytes(b)
+    product = sa.mul(sb, xm.AES_POLYNOMIAL).tobytes()
+    assert list(product) == [xm.ffmul(x, y) for x, y in zip(a, b)]
+    inverse = sa.inverse(xm.AES_POLYNOMIAL)
+    assert list(inverse.mul(sa, xm.AES_POLYNOMIAL).tobytes()) == [0] + [1] * 255
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+import finite
+import dangercrypt.xtra.dlog as xdl
+
+
+@pytest.mark.parametrize("n", [2, 7, 9, 256, 10007, 3 ** 20, 2 ** 40, 2 ** 64])
+def test_discrete_log_generator(n):
+    field = finite.Field(n)
+    g = field.generator()
+    rng = random.Random(n)
+    for _ in range(5):
+        x = rng.randrange(n - 1)
+        assert xdl.discrete_log(g ** x) == x
+
+
+@pytest.mark.parametrize("n", [16, 10007, 2 ** 40])
+def test_discrete_log_other_base(n):
+    field = finite.Field(n)
+    rng = random.Random(n)
+    for _ in range(5):
+        base = field.element(rng.randrange(1, n))
+        order = xdl.element_order(base, n - 1)
+        x = rng.randrange(order)
+        assert xdl.discrete_log(base ** x, base) == x
+
+
+def test_discrete_log_not_a_power():
+    field = finite.Field(2 ** 40)
+    g = field.generator()
+    # g^3 generates the subgroup of index 3, which g isn't in
+    with pytest.raises(ValueError, match="not a power"):
+        xdl.discrete_log(g, g ** 3)
+
+
+def test_discrete_log_zero():
+    field = finite.Field(11)
+    with pytest.raises(ValueError, match="zero"):
+        xdl.discrete_log(field.element(0))
+
+
+def test_element_order():
+    field = finite.Field(13)
+    assert xdl.element_order(field.element(1), 12) == 1
+    assert xdl.element_order(field.element(12), 12) == 2
+    assert xdl.element_order(field.element(3), 12) == 3
+    assert xdl.element_order(field.element(2), 12) == 12
+
+
+@pytest.mark.parametrize("solve", [xdl.bsgs, xdl.rho])
+def test_prime_order_solvers(solve):
+    # squares mod 2039 = 2 * 1019 + 1 have order 1019
+    field = finite.Field(2039)
+    base = field.element(4)
+    assert xdl.element_order(base, 2038) == 1019
+    for x in [0, 1, 2, 500, 1018]:
+        assert solve(base, base ** x, 1019) == x
+
+
+def test_solvers_outside_subgroup():
+    field = finite.Field(2039)
+    base = field.element(4)
+    outside = field.element(2039 - 1)  # -1 has order 2
+    assert xdl.bsgs(base, outside, 1019) is None
+    assert xdl.rho(base, outside, 1019) is None
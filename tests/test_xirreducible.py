@@ -0,0 +1,108 @@
+import itertools
+import random
+
+import pytest
+
+import finite
+from dangercrypt.xtra import irreducible
+from dangercrypt.xtra import polystore
+
+
+# number of monic irreducible polynomials of degree n over GF(p) (OEIS A001037,
+# A027376, A001692), and primitive ones (phi(p^n - 1) / n)
+IRREDUCIBLE_COUNTS = {(2, 2): 1, (2, 3): 2, (2, 4): 3, (2, 8): 30, (3, 3): 8, (5, 2): 10}
+PRIMITIVE_COUNTS = {(2, 1): 1, (5, 1): 2, (7, 1): 2, (2, 4): 2, (2, 8): 16, (3, 3): 4, (5, 2): 4}
+
+
+@pytest.mark.parametrize("prime, degree", sorted(IRREDUCIBLE_COUNTS))
+def test_counts(prime, degree):
+    found = list(irreducible.irreducible_polys(degree, prime))
+    assert len(found) == IRREDUCIBLE_COUNTS[prime, degree]
+
+
+@pytest.mark.parametrize("prime, degree", sorted(PRIMITIVE_COUNTS))
+def test_primitive_counts(prime, degree):
+    found = list(irreducible.irreducible_polys(degree, prime, primitive=True))
+    assert len(found) == PRIMITIVE_COUNTS[prime, degree]
+
+
+@pytest.mark.parametrize(
+    "prime, power",
+    [(prime, power) for prime, polys in finite.POLY_MIN_WEIGHT.items() for power in polys],
+)
+def test_poly_min_weight(prime, power):
+    poly = finite.POLY_MIN_WEIGHT[prime][power]
+    assert irreducible.is_irreducible(poly, prime)
+    # the AES polynomial is the one deliberately non-primitive entry
+    assert irreducible.is_primitive(poly, prime) is not ((prime, power) == (2, 8))
+
+
+@pytest.mark.parametrize("prime", [2, 3, 5])
+def test_x_is_not_primitive(prime):
+    # irreducible, but its root x is 0
+    assert irreducible.is_irreducible([0, 1], prime)
+    assert not irreducible.is_primitive([0, 1], prime)
+    assert not irreducible.is_primitive([0, prime - 1], prime)
+    # unreduced coefficients: still x
+    assert not irreducible.is_primitive([prime, 1], prime)
+    assert not irreducible.is_primitive([2 * prime, prime + 1], prime)
+
+
+@pytest.mark.parametrize("prime, power", [(2, 2), (3, 2), (5, 3), (2, 8)])
+def test_matches_field_tables(prime, power):
+    """x is primitive exactly when it generates all of the field"""
+    for poly in itertools.islice(irreducible.irreducible_polys(power, prime), 5):
+        f = finite.Field(prime ** power, poly)
+        x = f.element([0, 1] + [0] * (power - 2))
+        order = next(k for k in range(1, f.n) if x ** k == f.element(1))
+        assert (order == f.n - 1) is irreducible.is_primitive(poly, prime)
+
+
+@pytest.mark.parametrize(
+    "poly, prime",
+    [
+        ([1, 0, 1], 2),  # (x + 1)^2
+        ([0, 1, 1], 2),  # x(x + 1)
+        ([1, 0, 0, 0, 1], 2),
+        ([2, 0, 1], 3),  # x^2 - 1
+        ([1, 0, 0, 0, 0, 0, 1], 3),
+        ([0], 5),
+        ([4], 5),
+    ],
+)
+def test_reducible(poly, prime):
+    assert not irreducible.is_irreducible(poly, prime)
+
+
+def test_not_monic():
+    # 2x^2 + 2x + 4 = 2(x^2 + x + 2), and x^2 + x + 2 has no roots mod 5
+    assert irreducible.is_irreducible([4, 2, 2], 5)
+
+
+@pytest.mark.skipif(polystore.default_store() is None, reason="store not built")
+@pytest.mark.parametrize("prime", [2, 3, 5, 7, 11, 13, 17, 19, 23])
+def test_catalogue(prime):
+    rng = random.Random(prime)
+    store = polystore.default_store()
+    degrees = store.degrees(prime)
+    for degree in [degrees.start] + rng.sample(degrees, 3):
+        assert irreducible.is_irreducible(store.get(prime, degree), prime), degree
+
+
+def test_catalogue_big_gf2():
+    assert irreducible.is_irreducible(polystore.lookup(2, 1000), 2)
+
+
+def test_random_irreducible():
+    rng = random.Random(0)
+    poly = irreducible.random_irreducible(6, 3, rng=rng)
+    assert len(poly) == 7 and poly[-1] == 1
+    assert irreducible.is_irreducible(poly, 3)
+    poly = irreducible.random_irreducible(16, 2, primitive=True, rng=rng)
+    assert irreducible.is_primitive(poly, 2)
+
+
+def test_process_pool_matches_serial():
+    serial = list(irreducible.irreducible_polys(5, 3))
+    parallel = list(irreducible.irreducible_polys(5, 3, processes=2, chunksize=8))
+    assert parallel == serial
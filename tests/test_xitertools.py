@@ -35,3 +35,50 @@ def test_pumper_bad_n(n, raises):
 
 def test_chunks():
     assert list(xit.chunks(range(3), 2)) == [[0, 1], [2]]
+
+
+@pytest.mark.parametrize("pad", [xit.NO_PAD, 0])
+def test_chunks_generic(pad):
+    expected = [[0, 1, 2], [3, 4, 5], [6]]
+    if pad is not xit.NO_PAD:
+        expected[-1] += [pad, pad]
+    assert list(xit.chunks(iter(range(7)), 3, pad=pad)) == expected
+    assert list(xit.chunks(list(range(7)), 3, pad=pad)) == expected
+    assert list(xit.chunks(tuple(range(7)), 3, pad=pad)) == [tuple(c) for c in expected]
+    assert [bytes(c) for c in xit.chunks(bytes(range(7)), 3, pad=pad)] == [
+        bytes(c) for c in expected
+    ]
+
+
+@pytest.mark.parametrize("pad", [None, "beep", 256, -1])
+def test_chunks_buffer_odd_pad(pad):
+    # a pad the buffer can't hold gives a list for the last chunk, as it used to
+    pieces = list(xit.chunks(b"abc", 2, pad=pad))
+    assert list(pieces[0]) == [97, 98]
+    assert pieces[1] == [99, pad]
+
+
+def test_chunks_buffer_views():
+    data = bytearray(range(10))
+    pieces = list(xit.chunks(data, 4))
+    assert all(isinstance(p, memoryview) for p in pieces)
+    assert [len(p) for p in pieces] == [4, 4, 2]
+    pieces[1][0] = 0xFF  # a view, not a copy
+    assert data[4] == 0xFF
+
+
+def test_chunks_out_buffer():
+    out = bytearray(4)
+    seen = []
+    for chunk in xit.chunks((x for x in range(10)), 4, out=out):
+        seen.append(bytes(chunk))
+    assert seen == [bytes([0, 1, 2, 3]), bytes([4, 5, 6, 7]), bytes([8, 9])]
+    full = list(xit.chunks(iter(range(8)), 4, out=out))
+    assert full[0] is out and full[1] is out
+    with pytest.raises(ValueError):
+        list(xit.chunks(range(8), 3, out=out))
+
+
+def test_chunks_bad_n():
+    with pytest.raises(ValueError, match=">= 1"):
+        xit.chunks(b"abc", 0)
@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 import dangercrypt.xtra.math as xm
@@ -33,3 +35,59 @@ def test_ffmul():
 
 def test_pcadd():
     assert xm.pcadd([0, 1, 2, 3], [2, 3, 5, 7]) == [2, 2, 7, 4]
+
+
+def test_ffmul_other_widths():
+    # GF(2^4) mod x^4 + x + 1: x^3 * x = x + 1
+    assert xm.ffmul(0b1000, 0b0010, polynomial=0b10011) == 0b0011
+    # GF(2^16) mod x^16 + x^5 + x^3 + x + 1 (data/irreducible-polys)
+    poly16 = (1 << 16) | 0b101011
+    assert xm.ffmul(0x8000, 0x0002, polynomial=poly16) == 0b101011
+
+
+@pytest.mark.parametrize("width", [2, 3, 4, 8, 9, 12, 16, 24])
+def test_ffmultiplier_matches_ffmul(width):
+    mul = xm.ffmultiplier(width)
+    assert mul.polynomial.bit_length() == width + 1
+    rng = random.Random(width)
+    for _ in range(300):
+        a = rng.randrange(mul.size)
+        b = rng.randrange(mul.size)
+        assert mul(a, b) == xm.ffmul(a, b, mul.polynomial)
+
+
+def test_ffmultiplier_strategies():
+    assert xm.ffmultiplier(8).product is not None
+    assert xm.ffmultiplier(12).product is None
+    assert xm.ffmultiplier(12).exp is not None
+    assert xm.ffmultiplier(24).exp is None
+    assert xm.ffmultiplier(8) is xm.ffmultiplier(8, xm.AES_POLYNOMIAL)
+
+
+def test_ffmultiplier_width_1():
+    # GF(2): the multiplicative group is just {1}
+    mul = xm.FFMultiplier(1, 0b11)
+    assert [mul(a, b) for a in range(2) for b in range(2)] == [0, 0, 0, 1]
+
+
+def test_ffmultiplier_rejects_reducible():
+    with pytest.raises(ValueError, match="reducible"):
+        xm.FFMultiplier(8, 0b1_0000_0001)
+    with pytest.raises(ValueError, match="degree"):
+        xm.FFMultiplier(4, xm.AES_POLYNOMIAL)
+
+
+def test_ffmul_many():
+    rng = random.Random(0)
+    a = bytes(rng.randrange(256) for _ in range(1000))
+    b = bytearray(rng.randrange(256) for _ in range(1000))
+    assert xm.ffmul_many(a, b) == bytes(xm.ffmul(x, y) for x, y in zip(a, b))
+    assert xm.ffmul_many(a, 0x02) == bytes(xm.ffmul(x, 0x02) for x in a)
+
+
+@pytest.mark.parametrize("width", [4, 12])
+def test_ffmultiplier_many_other_widths(width):
+    mul = xm.ffmultiplier(width)
+    a = list(range(mul.size))
+    assert list(mul.many(a, a)) == [mul(x, x) for x in a]
+    assert list(mul.many(a, 3)) == [mul(x, 3) for x in a]
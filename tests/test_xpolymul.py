@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+import finite
+import dangercrypt.xtra.polymul as xpm
+
+
+def _random_poly(rng, n, prime):
+    return [rng.randrange(prime) for _ in range(n)]
+
+
+@pytest.mark.parametrize("method", sorted(xpm.METHODS))
+@pytest.mark.parametrize("prime", [2, 3, 7, 251])
+@pytest.mark.parametrize("n_a, n_b", [(1, 1), (1, 9), (5, 3), (64, 64), (100, 37), (300, 301)])
+def test_methods_agree(method, prime, n_a, n_b):
+    rng = random.Random(n_a * 1000 + n_b + prime)
+    a = _random_poly(rng, n_a, prime)
+    b = _random_poly(rng, n_b, prime)
+    assert xpm.mul(a, b, prime, method=method) == xpm.schoolbook(a, b, prime)
+
+
+def test_mul_known():
+    # (1 + x)(1 + x) = 1 + x^2 over GF(2), 1 + 2x + x^2 over GF(3)
+    assert xpm.mul([1, 1], [1, 1], 2) == [1, 0, 1]
+    assert xpm.mul([1, 1], [1, 1], 3) == [1, 2, 1]
+    # length is len(a) + len(b) - 1 even with zero high terms
+    assert xpm.mul([1, 0, 0], [2, 0], 5) == [2, 0, 0, 0]
+
+
+def test_mul_empty():
+    assert xpm.mul([], [1, 2], 3) == [0]
+    assert xpm.mul([1, 2], [], 3) == [0]
+
+
+def test_choose():
+    assert xpm.choose(4, 4000, 3) == "schoolbook"
+    assert xpm.choose(1000, 1000, 3) == "kronecker"
+    # products too large for 8-byte slots
+    huge = 1 << 40
+    assert xpm.choose(20, 20, huge) == "schoolbook"
+    assert xpm.choose(1000, 1000, huge) == "karatsuba"
+    # anything the NTT can hold packs too
+    assert xpm.choose(1000, 1000, 30000) == "kronecker"
+
+
+def test_ntt_fits():
+    assert xpm.ntt_fits(1000, 1000, 3)
+    assert not xpm.ntt_fits(1000, 1000, 1 << 20)
+    with pytest.raises(ValueError, match="too large"):
+        xpm.ntt([1] * 10, [1] * 10, 1 << 20)
+
+
+def test_kronecker_too_wide():
+    with pytest.raises(ValueError, match="too large to pack"):
+        xpm.kronecker([1, 2], [3, 4], 1 << 40)
+
+
+def test_big_prime_karatsuba():
+    prime = (1 << 61) - 1
+    rng = random.Random(61)
+    a = _random_poly(rng, 150, prime)
+    b = _random_poly(rng, 130, prime)
+    assert xpm.karatsuba(a, b, prime) == xpm.schoolbook(a, b, prime)
+
+
+@pytest.mark.parametrize("q", [3 ** 200, 2 ** 300, 5 ** 60])
+def test_big_field_mul(q):
+    field = finite.Field(q)
+    rng = random.Random(q)
+    a = field.element(rng.randrange(1, q))
+    b = field.element(rng.randrange(1, q))
+    c = field.element(rng.randrange(1, q))
+    assert a * b == b * a
+    assert (a * b) * c == a * (b * c)
+    assert a * (b + c) == a * b + a * c
+    assert a * field.element(1) == a
+
+
+def test_unpack_split():
+    field = finite.Field(3 ** 200)
+    rng = random.Random(3)
+    for _ in range(20):
+        value = rng.randrange(field.n)
+        coeff = field.unpack(value)
+        assert len(coeff) == 200
+        assert field.pack(coeff) == value
+
+
+@pytest.mark.parametrize("slot", [1, 2, 4, 8])
+def test_slots_roundtrip(slot):
+    rng = random.Random(slot)
+    coeffs = [rng.randrange(1 << (8 * slot)) for _ in range(20)]
+    packed = xpm.pack_slots(coeffs, slot)
+    assert packed == sum(c << (8 * slot * k) for k, c in enumerate(coeffs))
+    assert xpm.unpack_slots(packed, 20, slot).tolist() == coeffs
+
+
+def test_slot_sizes():
+    assert xpm.slot_bytes(255) == 1
+    assert xpm.slot_bytes(256) == 2
+    assert xpm.slot_bytes(1 << 64) is None
+    assert xpm.array_typecode(256) == "B"
+    assert xpm.array_typecode(257) == "H"
+    with pytest.raises(ValueError, match="no array type"):
+        xpm.array_typecode(1 << 65)
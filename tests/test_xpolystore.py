@@ -0,0 +1,69 @@
+import pytest
+
+import finite
+from dangercrypt.xtra import polystore
+
+
+CATALOGUE = {
+    2: {2: {0: 1, 1: 1, 2: 1}, 3: {0: 1, 1: 1, 3: 1}, 5: {0: 1, 2: 1, 5: 1}},
+    9: {2: {0: 3, 1: 1, 2: 1}},
+}
+DEFINING = {9: {0: 1, 2: 1}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "polys.bin"
+    polystore.write_store(path, CATALOGUE, DEFINING)
+    with polystore.PolyStore(path) as store:
+        yield store
+
+
+def test_roundtrip(store):
+    assert store.fields == [2, 9]
+    assert store.degrees(2) == range(2, 6)
+    assert store.get(2, 3) == [1, 1, 0, 1]
+    assert store.terms(2, 5) == {0: 1, 2: 1, 5: 1}
+    assert store.get(9, 2) == [3, 1, 1]
+    assert store.defining_poly(9) == [1, 0, 1]
+    assert store.defining_poly(2) is None
+
+
+def test_missing(store):
+    assert store.get(2, 4) is None  # gap in the degrees
+    assert store.get(2, 6) is None
+    assert store.get(3, 2) is None
+    assert (2, 4) not in store
+    assert (2, 5) in store
+
+
+def test_bad_magic(tmp_path):
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"nope" + bytes(100))
+    with pytest.raises(ValueError, match="not a polynomial store"):
+        polystore.PolyStore(path)
+
+
+@pytest.mark.skipif(polystore.default_store() is None, reason="store not built")
+def test_default_store_matches_text():
+    path = polystore.DEFAULT_PATH.parent / "F2-2to10000.txt"
+    lines = path.read_text().splitlines()
+    for line in [lines[0], lines[6], lines[-1]]:
+        degree, *powers = (int(x) for x in line.split(","))
+        expected = [0] * (degree + 1)
+        for k in [0, degree] + powers:
+            expected[k] = 1
+        assert polystore.lookup(2, degree) == expected
+
+    assert polystore.lookup(2, 8) == [1, 1, 0, 1, 1, 0, 0, 0, 1]
+    assert polystore.lookup(3, 7) == [2, 0, 1, 0, 0, 0, 0, 1]
+    assert polystore.default_store().defining_poly(16) == [1, 1, 0, 0, 1]
+
+
+@pytest.mark.skipif(polystore.default_store() is None, reason="store not built")
+def test_field_uses_store():
+    f = finite.Field(3 ** 7)
+    assert f.mod_poly == polystore.lookup(3, 7)
+    assert f.tables is not None
+    el = f.element(1000)
+    assert el * el.inverse() == f.element(1)
@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+import dangercrypt.xtra.primes as xp
+
+
+def test_sieve():
+    assert xp.sieve(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert xp.sieve(2) == []
+    assert len(xp.SMALL_PRIMES) == 6542  # pi(2^16)
+
+
+@pytest.mark.parametrize(
+    "n, expected",
+    [
+        (0, False),
+        (1, False),
+        (2, True),
+        (65521, True),  # largest prime below 2^16
+        (65537, True),
+        (2 ** 61 - 1, True),
+        (2 ** 89 - 1, True),  # above the deterministic limit
+        (561, False),  # Carmichael
+        (3215031751, False),  # strong pseudoprime to bases 2, 3, 5, 7
+        (2 ** 64 + 1, False),
+        ((2 ** 61 - 1) * (2 ** 31 - 1), False),
+    ],
+)
+def test_is_prime(n, expected):
+    assert xp.is_prime(n) is expected
+
+
+def test_is_prime_matches_sieve():
+    small = set(xp.sieve(5000))
+    assert [n for n in range(5000) if xp.is_prime(n)] == sorted(small)
+
+
+@pytest.mark.parametrize(
+    "n, expected",
+    [
+        (1, {}),
+        (2, {2: 1}),
+        (5040, {2: 4, 3: 2, 5: 1, 7: 1}),
+        (2 ** 64 - 1, {3: 1, 5: 1, 17: 1, 257: 1, 641: 1, 65537: 1, 6700417: 1}),
+        (3 ** 40 - 1, None),
+        (2 ** 128 - 1, None),
+        (10000000019 * 10000000033, {10000000019: 1, 10000000033: 1}),
+    ],
+)
+def test_factorize(n, expected):
+    factors = xp.factorize(n)
+    if expected is not None:
+        assert factors == expected
+    assert math.prod(p ** k for p, k in factors.items()) == n
+    assert all(xp.is_prime(p) for p in factors)
+    assert list(factors) == sorted(factors)
+
+
+def test_factorize_result_is_a_copy():
+    factors = xp.factorize(360)
+    factors[7] = 1
+    del factors[2]
+    assert xp.factorize(360) == {2: 3, 3: 2, 5: 1}
+
+
+def test_prime_factors():
+    assert xp.prime_factors(360) == [2, 2, 2, 3, 3, 5]
+
+
+def test_pollard_rho():
+    n = 1000003 * 1000033
+    d = xp.pollard_rho(n)
+    assert d in {1000003, 1000033}
+
+
+def test_factorize_rejects_nonpositive():
+    with pytest.raises(ValueError):
+        xp.factorize(0)